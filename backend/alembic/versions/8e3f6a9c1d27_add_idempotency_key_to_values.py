@@ -0,0 +1,33 @@
+"""Add idempotency_key to Values
+
+Revision ID: 8e3f6a9c1d27
+Revises: 5b1e0c7d2a41
+Create Date: 2026-10-18 11:02:15.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3f6a9c1d27'
+down_revision: Union[str, Sequence[str], None] = '5b1e0c7d2a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('values', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('idempotency_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_values_form_idempotency_key', ['form_id', 'idempotency_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('values', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_values_form_idempotency_key', type_='unique')
+        batch_op.drop_column('idempotency_key')
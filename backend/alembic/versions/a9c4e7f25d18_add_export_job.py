@@ -0,0 +1,62 @@
+"""Add ExportJob
+
+Revision ID: a9c4e7f25d18
+Revises: f3b8d2e61a07
+Create Date: 2026-10-18 17:48:12.330954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e7f25d18'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2e61a07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('exportjob',
+    sa.Column('form_id', sa.Integer(), nullable=False),
+    sa.Column('format', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('gzip', sa.Boolean(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=True),
+    sa.Column('start_date', sa.DateTime(), nullable=True),
+    sa.Column('end_date', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tenant_id', sa.Integer(), nullable=False),
+    sa.Column('requested_by_id', sa.Integer(), nullable=True),
+    sa.Column('dedupe_key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('rows_total', sa.Integer(), nullable=True),
+    sa.Column('rows_done', sa.Integer(), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=True),
+    sa.Column('file_path', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('error', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['form_id'], ['form.id'], ),
+    sa.ForeignKeyConstraint(['requested_by_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenant.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exportjob_status'), 'exportjob', ['status'], unique=False)
+    op.create_index(op.f('ix_exportjob_tenant_id'), 'exportjob', ['tenant_id'], unique=False)
+    op.create_index('uq_exportjob_active_dedupe_key', 'exportjob', ['dedupe_key'], unique=True,
+                    postgresql_where=sa.text("status IN ('pending', 'running')"),
+                    sqlite_where=sa.text("status IN ('pending', 'running')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_exportjob_active_dedupe_key', table_name='exportjob')
+    op.drop_index(op.f('ix_exportjob_tenant_id'), table_name='exportjob')
+    op.drop_index(op.f('ix_exportjob_status'), table_name='exportjob')
+    op.drop_table('exportjob')
@@ -0,0 +1,34 @@
+"""Add analysis_status to Values
+
+Revision ID: b2d94f0e7c13
+Revises: 8e3f6a9c1d27
+Create Date: 2026-10-18 12:20:48.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d94f0e7c13'
+down_revision: Union[str, Sequence[str], None] = '8e3f6a9c1d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows were scored inline on submit
+    with op.batch_alter_table('values', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analysis_status', sqlmodel.sql.sqltypes.AutoString(), server_default='complete', nullable=False))
+        batch_op.create_index(batch_op.f('ix_values_analysis_status'), ['analysis_status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('values', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_values_analysis_status'))
+        batch_op.drop_column('analysis_status')
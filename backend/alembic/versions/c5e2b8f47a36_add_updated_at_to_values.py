@@ -0,0 +1,38 @@
+"""Add updated_at to Values
+
+Revision ID: c5e2b8f47a36
+Revises: a9c4e7f25d18
+Create Date: 2026-10-18 20:12:37.540193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e2b8f47a36'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e7f25d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('values', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Existing rows start out unchanged since they were created
+    op.execute('UPDATE "values" SET updated_at = created_at')
+    with op.batch_alter_table('values', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+    # Changes feed: a form's responses by (updated_at, id)
+    op.create_index('ix_values_form_updated_id', 'values', ['form_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_values_form_updated_id', table_name='values')
+    with op.batch_alter_table('values', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,31 @@
+"""Add rate_limit_per_minute to SubscriptionPlan
+
+Revision ID: d41f8a2b6e90
+Revises: b2d94f0e7c13
+Create Date: 2026-10-18 13:05:12.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f8a2b6e90'
+down_revision: Union[str, Sequence[str], None] = 'b2d94f0e7c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('subscriptionplan', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rate_limit_per_minute', sa.Integer(), server_default='30', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('subscriptionplan', schema=None) as batch_op:
+        batch_op.drop_column('rate_limit_per_minute')
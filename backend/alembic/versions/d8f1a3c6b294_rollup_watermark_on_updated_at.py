@@ -0,0 +1,36 @@
+"""Track the rollup watermark on Values.updated_at
+
+Revision ID: d8f1a3c6b294
+Revises: c5e2b8f47a36
+Create Date: 2026-10-18 21:06:14.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f1a3c6b294'
+down_revision: Union[str, Sequence[str], None] = 'c5e2b8f47a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The ID watermark can't be translated: the next run rolls everything up again
+    with op.batch_alter_table('rollupwatermark', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_updated_at', sa.DateTime(), nullable=True))
+        batch_op.drop_column('last_value_id')
+    op.create_index('ix_values_updated_at', 'values', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_values_updated_at', table_name='values')
+    with op.batch_alter_table('rollupwatermark', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_value_id', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.drop_column('last_updated_at')
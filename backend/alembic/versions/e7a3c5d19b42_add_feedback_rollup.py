@@ -0,0 +1,52 @@
+"""Add FeedbackRollup and RollupWatermark
+
+Revision ID: e7a3c5d19b42
+Revises: d41f8a2b6e90
+Create Date: 2026-10-18 14:32:07.615840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c5d19b42'
+down_revision: Union[str, Sequence[str], None] = 'd41f8a2b6e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('feedbackrollup',
+    sa.Column('form_id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('field_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('sum', sa.Float(), nullable=False),
+    sa.Column('histogram', sa.JSON(), nullable=True),
+    sa.Column('positive', sa.Integer(), nullable=False),
+    sa.Column('negative', sa.Integer(), nullable=False),
+    sa.Column('neutral', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['form_id'], ['form.id'], ),
+    sa.PrimaryKeyConstraint('form_id', 'location_id', 'day', 'field_id')
+    )
+    op.create_index(op.f('ix_feedbackrollup_day'), 'feedbackrollup', ['day'], unique=False)
+    op.create_table('rollupwatermark',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('last_value_id', sa.Integer(), nullable=False),
+    sa.Column('frontier', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rollupwatermark')
+    op.drop_index(op.f('ix_feedbackrollup_day'), table_name='feedbackrollup')
+    op.drop_table('feedbackrollup')
@@ -0,0 +1,30 @@
+"""Add (form_id, created_at, id) index to Values
+
+Revision ID: f3b8d2e61a07
+Revises: e7a3c5d19b42
+Create Date: 2026-10-18 16:05:41.902317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2e61a07'
+down_revision: Union[str, Sequence[str], None] = 'e7a3c5d19b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pagination of a form's responses, newest first
+    op.create_index('ix_values_form_created_id', 'values', ['form_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_values_form_created_id', table_name='values')
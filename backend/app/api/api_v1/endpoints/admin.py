@@ -1,18 +1,24 @@
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Body, Request
-from sqlmodel import Session, select, func, update
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, select, update
 
 from app.api import deps
 from app.models.tenant import Tenant, TenantCreate, TenantRead, TenantWithAdmin, TenantUsage
 from app.models.user import User, UserCreate, UserRole
-from app.models.form import Form, Values
-from app.models.location import Location
 from app.models.plan import SubscriptionPlan, SubscriptionPlanCreate
 from app.models.feature import FeatureFlag, FeatureFlagCreate
 from app.models.audit import AuditLog
 from app.models.setting import SystemSetting, SystemSettingCreate
 from app.core.audit import audit_service
+from app.core.limiter import limiter
+from app.core.public_cache import public_form_cache
+from app.core.metrics import metrics
+from app.services.rollup_service import rollup_service
+from app.services.tenant_summary_service import tenant_summary_service, TenantSummary
+from app.services.admin_overview_service import admin_overview_service
+from app.services.export_service import export_service
 from app.core.security import get_password_hash
 from pydantic import BaseModel, EmailStr, field_validator
 import secrets
@@ -29,54 +35,28 @@ def get_admin_stats(
 ) -> Any:
     """
     Get platform-wide statistics for Super Admin dashboard.
+    Cached for ADMIN_OVERVIEW_TTL_SECONDS.
     """
-    
-    # Tenant Metrics
-    total_tenants = db.exec(select(func.count(Tenant.id))).one()
-    active_tenants = db.exec(select(func.count(Tenant.id)).where(Tenant.is_active == True)).one()
-    
-    seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    new_tenants_7d = db.exec(select(func.count(Tenant.id)).where(Tenant.created_at >= seven_days_ago)).one()
-    
-    # Feedback Metrics
-    total_feedback = db.exec(select(func.count(Values.id))).one()
-    
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    feedback_today = db.exec(select(func.count(Values.id)).where(Values.created_at >= today_start)).one()
-    
-    # Subscription Breakdown
-    # Get distinct plan names and their tenant counts
-    # This roughly replicates: SELECT plan.name, COUNT(tenant.id) FROM tenant JOIN plan ON ... GROUP BY plan.name
-    
-    # SQLModel doesn't support easy GROUP BY with relations in one go sometimes, so we can iterate plans or use raw SQL.
-    # For MVP scale, querying plans + counting is fine.
-    plans = db.exec(select(SubscriptionPlan)).all()
-    plan_stats = []
-    for plan in plans:
-        count = db.exec(select(func.count(Tenant.id)).where(Tenant.plan_id == plan.id)).one()
-        plan_stats.append({"name": plan.name, "count": count})
-
-    # Error Rate (Mock Analysis)
-    # real system would query logs or separate "ErrorLog" table
-    error_rate = 0.05 # 0.05%
-    
+    overview = admin_overview_service.get(db)
+
     return {
-        "tenants": {
-            "total": total_tenants,
-            "active": active_tenants,
-            "new_7d": new_tenants_7d
-        },
-        "feedback": {
-            "total": total_feedback,
-            "today": feedback_today
-        },
-        "subscriptions": plan_stats,
+        **overview,
         "system_health": {
-            "error_rate_24h": error_rate,
+            "error_rate_24h": round(metrics.error_rate(hours=24), 4), # Share of 5xx responses
             "status": "healthy"
         }
     }
 
+def _with_admin(tenant: Tenant, summary: TenantSummary) -> TenantWithAdmin:
+    data = TenantWithAdmin.from_orm(tenant)
+    data.admin_email = summary.admin_email
+    data.usage = TenantUsage(
+        forms_count=summary.forms_count,
+        locations_count=summary.locations_count,
+        submissions_count=summary.submissions_count
+    )
+    return data
+
 @router.get("/tenants", response_model=List[TenantWithAdmin])
 def list_tenants(
     skip: int = 0,
@@ -92,25 +72,8 @@ def list_tenants(
     if search:
         query = query.where(Tenant.name.contains(search) | Tenant.slug.contains(search))
     tenants = db.exec(query.offset(skip).limit(limit)).all()
-    
-    results = []
-    for t in tenants:
-        admin = db.exec(select(User).where(User.tenant_id == t.id).where(User.role == UserRole.TENANT_ADMIN)).first()
-        
-        # Calculate usage summary
-        forms_count = db.exec(select(func.count(Form.id)).where(Form.tenant_id == t.id)).one()
-        locations_count = db.exec(select(func.count(Location.id)).where(Location.tenant_id == t.id)).one()
-        submissions_count = db.exec(select(func.count(Values.id)).join(Form).where(Form.tenant_id == t.id)).one()
-
-        data = TenantWithAdmin.from_orm(t)
-        data.admin_email = admin.email if admin else None
-        data.usage = TenantUsage(
-            forms_count=forms_count,
-            locations_count=locations_count,
-            submissions_count=submissions_count
-        )
-        results.append(data)
-    return results
+    summaries = tenant_summary_service.summaries(db, [t.id for t in tenants])
+    return [_with_admin(t, summaries.get(t.id, TenantSummary())) for t in tenants]
 
 class TenantCreateRequest(TenantCreate):
     admin_email: EmailStr
@@ -187,6 +150,7 @@ def create_tenant_admin(
             if "email" in err_msg:
                 raise HTTPException(status_code=400, detail="User email already registered. Please use a different email.")
         raise HTTPException(status_code=400, detail=f"Database Integrity Error: {e.orig}")
+    admin_overview_service.invalidate()
     
     audit_service.log_action(db=db, user=current_user, action="create_tenant", target_type="tenant", target_id=tenant.id, details=tenant.dict())
 
@@ -213,21 +177,28 @@ def get_tenant(
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found")
     
-    admin = db.exec(select(User).where(User.tenant_id == tenant.id).where(User.role == UserRole.TENANT_ADMIN)).first()
-    
-    # Calculate usage summary
-    forms_count = db.exec(select(func.count(Form.id)).where(Form.tenant_id == tenant.id)).one()
-    locations_count = db.exec(select(func.count(Location.id)).where(Location.tenant_id == tenant.id)).one()
-    submissions_count = db.exec(select(func.count(Values.id)).join(Form).where(Form.tenant_id == tenant.id)).one()
+    summary = tenant_summary_service.summaries(db, [tenant.id]).get(tenant.id, TenantSummary())
+    return _with_admin(tenant, summary)
 
-    data = TenantWithAdmin.from_orm(tenant)
-    data.admin_email = admin.email if admin else None
-    data.usage = TenantUsage(
-        forms_count=forms_count,
-        locations_count=locations_count,
-        submissions_count=submissions_count
+@router.get("/tenants/{tenant_id}/export", response_class=StreamingResponse)
+def export_tenant_dump(
+    tenant_id: int,
+    db: Session = Depends(deps.get_session),
+    current_user = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Full data dump of a tenant for offboarding: the tenant export plus its user accounts.
+    """
+    tenant = db.get(Tenant, tenant_id)
+    if not tenant:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    audit_service.log_action(db=db, user=current_user, action="export_tenant_dump", target_type="tenant", target_id=tenant.id)
+    return StreamingResponse(
+        export_service.iter_tenant_zip(tenant.id, include_users=True),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={export_service.tenant_filename(tenant, dump=True)}"}
     )
-    return data
 
 @router.post("/tenants/{tenant_id}/suspend", response_model=Tenant)
 def suspend_tenant(
@@ -244,6 +215,7 @@ def suspend_tenant(
     db.add(tenant)
     db.commit()
     db.refresh(tenant)
+    admin_overview_service.invalidate()
 
     action = "suspend_tenant" if suspend else "activate_tenant"
     audit_service.log_action(db=db, user=current_user, action=action, target_type="tenant", target_id=tenant.id)
@@ -264,6 +236,7 @@ def update_tenant_status(
     db.add(tenant)
     db.commit()
     db.refresh(tenant)
+    admin_overview_service.invalidate()
 
     action = "activate_tenant" if is_active else "suspend_tenant"
     audit_service.log_action(db=db, user=current_user, action=action, target_type="tenant", target_id=tenant.id)
@@ -505,37 +478,26 @@ def get_usage_metrics(
     # 1. Daily Submissions (Last 30 Days)
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
     
-    # SQLite specific date truncation
-    date_col = func.strftime('%Y-%m-%d', Values.created_at)
-    
-    results = db.exec(
-        select(date_col, func.count(Values.id))
-        .where(Values.created_at >= thirty_days_ago)
-        .group_by(date_col)
-        .order_by(date_col)
-    ).all()
-    
-    daily_data = [DailyMetric(date=r[0], count=r[1]) for r in results]
+    daily_data = [
+        DailyMetric(date=day.isoformat(), count=count)
+        for day, count in rollup_service.daily_counts(db, thirty_days_ago).items()
+    ]
     
     # Fill in missing dates? For simplicity, frontend can handle gaps or we just return what we have.
     
     # 2. Top Tenants by Volume
-    top_tenants_res = db.exec(
-        select(Tenant.name, func.count(Values.id))
-        .join(Form, Form.tenant_id == Tenant.id)
-        .join(Values, Values.form_id == Form.id)
-        .group_by(Tenant.id)
-        .order_by(func.count(Values.id).desc())
-        .limit(5)
-    ).all()
+    counts = rollup_service.tenant_counts(db)
+    top_ids = sorted(counts, key=counts.get, reverse=True)[:5]
+    names = dict(db.exec(select(Tenant.id, Tenant.name).where(Tenant.id.in_(top_ids))).all()) if top_ids else {}
+    top_tenants_res = [(names.get(tenant_id), counts[tenant_id]) for tenant_id in top_ids if tenant_id in names]
     
     top_tenants_data = [TenantMetric(tenant_name=r[0], count=r[1]) for r in top_tenants_res]
     
     return UsageMetrics(
         daily_submissions=daily_data,
         top_tenants=top_tenants_data,
-        requests_per_minute=42, # Mock
-        rate_limit_triggers=0 # Mock
+        requests_per_minute=round(metrics.requests_per_minute()), # All workers, last 5 minutes
+        rate_limit_triggers=limiter.trigger_count(hours=24)
     )
 
 # System Health
@@ -553,6 +515,7 @@ class SystemHealth(BaseModel):
     api_uptime_seconds: float
     active_workers: int
     error_rate_24h: float
+    public_form_cache: Dict[str, int] = {}
     recent_logs: List[SystemLog]
 
 @router.get("/metrics/health", response_model=SystemHealth)
@@ -587,8 +550,9 @@ def get_system_health(
         status="healthy" if db_connected else "degraded",
         db_connected=db_connected,
         api_uptime_seconds=uptime,
-        active_workers=4,
-        error_rate_24h=0.02,
+        active_workers=metrics.active_workers(),
+        error_rate_24h=round(metrics.error_rate(hours=24), 4),
+        public_form_cache=public_form_cache.stats(), # This worker only
         recent_logs=mock_logs
     )
 
@@ -0,0 +1,96 @@
+import os
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlmodel import Session, select
+from app.db.session import get_session
+from app.api import deps
+from app.models.export import ExportJob, ExportJobCreate, ExportJobRead
+from app.models.form import Form
+from app.models.user import User
+from app.services.export_service import export_service, ExportFormatError
+from app.services.export_worker import export_worker
+
+router = APIRouter()
+
+def _read(job: ExportJob) -> ExportJobRead:
+    data = ExportJobRead.model_validate(job)
+    if job.status == "complete":
+        data.progress = 1.0
+    elif job.rows_total:
+        data.progress = round(min(job.rows_done / job.rows_total, 1.0), 3)
+    return data
+
+def _get_job(db: Session, job_id: int, user: User) -> ExportJob:
+    job = db.get(ExportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job.tenant_id != user.tenant_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return job
+
+@router.post("/", response_model=ExportJobRead, status_code=202)
+def create_export(
+    job_in: ExportJobCreate,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+) -> Any:
+    """
+    Queue an export of a form's responses. Identical pending requests share one job.
+    """
+    form = db.get(Form, job_in.form_id)
+    if not form:
+        raise HTTPException(status_code=404, detail="Form not found")
+    if form.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    try:
+        export_service.check_format(job_in.format, job_in.gzip)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _read(export_worker.submit(db, form, job_in, current_user.id))
+
+@router.get("/", response_model=List[ExportJobRead])
+def list_exports(
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+    limit: int = 50,
+) -> Any:
+    """
+    Recent export jobs of the current tenant.
+    """
+    jobs = db.exec(
+        select(ExportJob).where(ExportJob.tenant_id == current_user.tenant_id)
+        .order_by(ExportJob.id.desc()).limit(limit)
+    ).all()
+    return [_read(job) for job in jobs]
+
+@router.get("/{job_id}", response_model=ExportJobRead)
+def get_export(
+    job_id: int,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+) -> Any:
+    return _read(_get_job(db, job_id, current_user))
+
+@router.get("/{job_id}/download")
+def download_export(
+    job_id: int,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+):
+    """
+    Download a finished export. Supports Range / If-Range for resuming.
+    """
+    job = _get_job(db, job_id, current_user)
+    if job.status == "expired":
+        raise HTTPException(status_code=410, detail="Export has expired")
+    if job.status != "complete" or not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+
+    form = db.get(Form, job.form_id)
+    return FileResponse(
+        job.file_path,
+        media_type=export_service.media_type(job.format, job.gzip),
+        filename=export_service.filename(form, job.format, job.gzip),
+        headers={"Cache-Control": "private, no-transform"},
+    )
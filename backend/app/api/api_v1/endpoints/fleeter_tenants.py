@@ -1,16 +1,13 @@
 from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select, func
+from sqlmodel import Session, select
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
 from app.api import deps
 from app.models.tenant import Tenant
-from app.models.plan import SubscriptionPlan
-from app.models.onboarding import Onboarding
-from app.models.form import Form, Values
-from app.models.location import Location
 from app.models.user import User
+from app.services.tenant_summary_service import tenant_summary_service, TenantSummary
 
 router = APIRouter()
 
@@ -41,16 +38,12 @@ def list_assigned_tenants(
     """
     query = select(Tenant).where(Tenant.assigned_fleeter_id == current_user.id)
     tenants = db.exec(query).all()
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    summaries = tenant_summary_service.summaries(db, [t.id for t in tenants], recent_since=seven_days_ago)
     
     results = []
     for t in tenants:
-        # Get usage snapshot
-        forms_count = db.exec(select(func.count(Form.id)).where(Form.tenant_id == t.id)).one()
-        locations_count = db.exec(select(func.count(Location.id)).where(Location.tenant_id == t.id)).one()
-        submissions_count = db.exec(select(func.count(Values.id)).join(Form).where(Form.tenant_id == t.id)).one()
-        
-        plan = db.get(SubscriptionPlan, t.plan_id) if t.plan_id else None
-        onboarding = db.exec(select(Onboarding).where(Onboarding.tenant_id == t.id)).first()
+        summary = summaries.get(t.id, TenantSummary())
         
         # Determine flags
         flags = []
@@ -58,15 +51,7 @@ def list_assigned_tenants(
             flags.append("Inactive")
         
         # Low usage: e.g. less than 5 submissions in the last 7 days
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        recent_submissions = db.exec(
-            select(func.count(Values.id))
-            .join(Form)
-            .where(Form.tenant_id == t.id)
-            .where(Values.created_at >= seven_days_ago)
-        ).one()
-        
-        if recent_submissions < 5:
+        if summary.recent_submissions_count < 5:
             flags.append("Low Usage")
             
         # Trial expiring: (Placeholder logic as trial_end not in model yet, but can be based on created_at + 14 days)
@@ -77,17 +62,17 @@ def list_assigned_tenants(
             id=t.id,
             name=t.name,
             slug=t.slug,
-            plan_name=plan.name if plan else "Free",
+            plan_name=summary.plan_name or "Free",
             created_at=t.created_at,
             is_active=t.is_active,
             usage=UsageSnapshot(
-                forms_count=forms_count,
-                locations_count=locations_count,
-                submissions_count=submissions_count
+                forms_count=summary.forms_count,
+                locations_count=summary.locations_count,
+                submissions_count=summary.submissions_count
             ),
-            onboarding_id=onboarding.id if onboarding else None,
+            onboarding_id=summary.onboarding_id,
             flags=flags,
-            admin_email=db.exec(select(User.email).where(User.tenant_id == t.id).where(User.role == "tenant_admin")).first()
+            admin_email=summary.admin_email
         ))
         
     return results
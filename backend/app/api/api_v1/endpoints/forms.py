@@ -1,18 +1,32 @@
-from typing import Any, Optional, Dict, List
-from datetime import datetime
-import csv
-import io
+from typing import Any, Optional, Dict, List, Tuple
+from datetime import datetime, timedelta, timezone
+import json
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 from sqlmodel import Session, select, SQLModel
-from app.db.session import get_session
+from app.db.session import get_session, get_async_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import selectinload
 from app.api import deps
-from app.models.form import Form, FormCreate, FormUpdate, FormRead, Values, ValuesCreate, FormBase
+from app.models.form import Form, FormCreate, FormUpdate, FormRead, Values, ValuesCreate, ValuesBatchItem, ValuesBatchResult, PublicFormRead, FeedbackTimeseries, FeedbackResponsePage
 from app.models.tenant import Tenant
 from app.models.user import User
-from sqlalchemy import func
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.exc import IntegrityError
 from app.models.plan import SubscriptionPlan
 from app.core.limiter import limiter
+from app.services.usage_service import usage_service, period_key
+from app.services.ingest_service import feedback_ingest, QuotaExceededError, DuplicateSubmissionError
+from app.services.validation_service import validation_service, FormValidationError
+from app.core.idempotency import recent_submissions
+from app.core.public_cache import public_form_cache, etag_matches
+from app.core.pagination import encode_cursor, decode_cursor
+from app.services.snapshot_service import snapshot_service
+from app.services.rollup_service import rollup_service
+from app.services.timeseries_service import timeseries_service
+from app.services.export_service import export_service, ExportFormatError
+from app.core.config import settings
 
 router = APIRouter()
 
@@ -77,6 +91,7 @@ def create_form(
     db.add(form)
     db.commit()
     db.refresh(form)
+    snapshot_service.sync_form(form)
     return form
 
 @router.get("/{id}", response_model=FormRead)
@@ -111,6 +126,7 @@ def update_form(
     if form.tenant_id != current_user.tenant_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    old_slug = form.slug
     form_data = form_in.dict(exclude_unset=True)
     for key, value in form_data.items():
         setattr(form, key, value)
@@ -118,6 +134,8 @@ def update_form(
     db.add(form)
     db.commit()
     db.refresh(form)
+    public_form_cache.invalidate(old_slug, form.slug)
+    snapshot_service.sync_form(form, old_slug=old_slug)
     return form
 
 @router.post("/{id}/set_default", response_model=FormRead)
@@ -139,6 +157,7 @@ def set_default_form(
     # 1. Unset existing default(s)
     statement = select(Form).where(Form.tenant_id == current_user.tenant_id, Form.is_default == True)
     existing_defaults = db.exec(statement).all()
+    changed_slugs = [form.slug] + [f.slug for f in existing_defaults]
     for f in existing_defaults:
         f.is_default = False
         db.add(f)
@@ -149,6 +168,9 @@ def set_default_form(
     
     db.commit()
     db.refresh(form)
+    public_form_cache.invalidate(*changed_slugs)
+    for f in {f.id: f for f in [form, *existing_defaults]}.values():
+        snapshot_service.sync_form(f)
     return form
 
 # --- Analytics Endpoint ---
@@ -157,10 +179,20 @@ from app.core.ai import ai_service
 
 # ... (omitted)
 
+def _response_filters(form_id: int, location_id: Optional[int], start_date: Optional[datetime], end_date: Optional[datetime]) -> list:
+    filters = [Values.form_id == form_id]
+    if location_id:
+        filters.append(Values.location_id == location_id)
+    if start_date:
+        filters.append(Values.created_at >= start_date)
+    if end_date:
+        filters.append(Values.created_at <= end_date)
+    return filters
+
 class FeedbackStat(SQLModel):
     total_responses: int
+    sentiment_counts: Dict[str, int] = {}
     field_summaries: Dict[str, Any] = {}
-    recent_responses: List[Any]
     ai_summary: Optional[str] = None
 
 @router.get("/{id}/stats", response_model=FeedbackStat)
@@ -181,160 +213,395 @@ def get_form_stats(
     if form.tenant_id != current_user.tenant_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # query
-    query = select(Values).where(Values.form_id == id)
-    
-    if location_id:
-        query = query.where(Values.location_id == location_id)
-    if start_date:
-        query = query.where(Values.created_at >= start_date)
-    if end_date:
-        query = query.where(Values.created_at <= end_date)
-        
-    responses = db.exec(query).all()
-    total = len(responses)
-    
-    # Calculate Field Summaries (Avg Rating)
+    filters = _response_filters(id, location_id, start_date, end_date)
+
+    # Counts and rating histograms: whole days from the rollup, the rest from raw rows
+    stats = rollup_service.form_stats(db, form, location_id, start_date, end_date)
+
     field_stats = {}
-    if form.form_schema and "fields" in form.form_schema:
-        for field in form.form_schema["fields"]:
-            if field.get("type") == "rating":
-                fid = field.get("id")
-                # Extract values
-                values = [r.data.get(fid) for r in responses if r.data.get(fid) is not None]
-                # Convert to ints
-                valid_values = []
-                for v in values:
-                    try: 
-                        valid_values.append(int(v))
-                    except: 
-                        pass
-                
-                if valid_values:
-                    avg = sum(valid_values) / len(valid_values)
-                else:
-                    avg = 0
-                
-                field_stats[fid] = {
-                    "label": field.get("label"),
-                    "type": "rating",
-                    "average": round(avg, 2),
-                    "count": len(valid_values)
-                }
-
-    # Recent list
-    recent = []
-    text_corpus = []
-    for r in responses[-50:]:
-        recent.append({
-            "id": r.id,
-            "created_at": r.created_at,
-            "data": r.data,
-            "location_id": r.location_id,
-            "sentiment": r.sentiment # Include sentiment in recent list
-        })
-        # Extract text for summary
-        if r.data:
-            for v in r.data.values():
-                if isinstance(v, str):
-                    text_corpus.append(v)
-    
+    for field in (form.form_schema or {}).get("fields", []):
+        if field.get("type") != "rating" or not field.get("id"):
+            continue
+        histogram = stats["histograms"].get(field["id"], {})
+        count = sum(histogram.values())
+        avg = sum(score * n for score, n in histogram.items()) / count if count else 0
+        field_stats[field["id"]] = {
+            "label": field.get("label"),
+            "type": "rating",
+            "average": round(avg, 2),
+            "count": count,
+            "histogram": dict(sorted(histogram.items())),
+        }
+
+    # AI summary over the text answers of the newest 50 responses
+    answers = db.exec(
+        select(Values.data).where(*filters).order_by(Values.created_at.desc(), Values.id.desc()).limit(50)
+    ).all()
+    text_corpus = [v for data in reversed(answers) for v in (data or {}).values() if isinstance(v, str)]
     summary = ai_service.generate_summary(text_corpus)
         
     return FeedbackStat(
-        total_responses=total,
+        total_responses=stats["total"],
+        sentiment_counts=stats["sentiment"],
         field_summaries=field_stats,
-        recent_responses=reversed(recent), # Show newest first
         ai_summary=summary
     )
 
+@router.get("/{id}/responses", response_model=FeedbackResponsePage)
+def list_form_responses(
+    id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    location_id: Optional[int] = None,
+    sentiment: Optional[str] = Query(None, pattern="^(positive|negative|neutral)$"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+) -> Any:
+    """
+    Responses newest first, paginated by (created_at, id) keyset.
+    """
+    form = db.get(Form, id)
+    if not form:
+        raise HTTPException(status_code=404, detail="Form not found")
+    if form.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = select(Values).where(*_response_filters(id, location_id, start_date, end_date))
+    if sentiment:
+        query = query.where(Values.sentiment == sentiment)
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(Values.created_at, Values.id) < tuple_(*after))
+
+    # One extra row tells us whether there is a next page
+    rows = db.exec(query.order_by(Values.created_at.desc(), Values.id.desc()).limit(limit + 1)).all()
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    return FeedbackResponsePage(items=rows[:limit], next_cursor=next_cursor)
+
+@router.get("/{id}/responses/changes")
+def list_form_response_changes(
+    id: int,
+    since: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+) -> Any:
+    """
+    Responses created or updated (e.g. sentiment scored) after the `since`
+    cursor, oldest change first, as NDJSON. Resume from the X-Next-Cursor
+    header; X-Has-More is false once caught up. Without `since` the feed
+    starts at the beginning (full sync). A row changed again is sent again.
+    """
+    form = db.get(Form, id)
+    if not form:
+        raise HTTPException(status_code=404, detail="Form not found")
+    if form.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    # Changes younger than the settle window are held back until the next sync
+    horizon = datetime.utcnow() - timedelta(seconds=settings.RESPONSE_CHANGES_SETTLE_SECONDS)
+    query = (
+        select(Values.id, Values.created_at, Values.updated_at, Values.location_id,
+               Values.data, Values.sentiment, Values.analysis_status)
+        .where(Values.form_id == id)
+        .where(Values.updated_at <= horizon)
+    )
+    if since:
+        try:
+            after = decode_cursor(since)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.where(tuple_(Values.updated_at, Values.id) > tuple_(*after))
+
+    rows = db.exec(query.order_by(Values.updated_at, Values.id).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    body = "".join(
+        json.dumps(
+            {"id": r.id, "created_at": r.created_at.isoformat(), "updated_at": r.updated_at.isoformat(),
+             "location_id": r.location_id, "data": r.data or {}, "sentiment": r.sentiment,
+             "analysis_status": r.analysis_status},
+            separators=(",", ":"), default=str,
+        ) + "\n"
+        for r in rows
+    )
 
-# --- Public Endpoints ---
+    headers = {"X-Has-More": "true" if has_more else "false"}
+    next_cursor = encode_cursor(rows[-1].updated_at, rows[-1].id) if rows else since
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/x-ndjson", headers=headers)
+
+@router.get("/{id}/timeseries", response_model=FeedbackTimeseries)
+def get_form_timeseries(
+    id: int,
+    bucket: str = Query("day", pattern="^(hour|day|week)$"),
+    metric: str = "count",
+    tz: str = "UTC",
+    location_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+) -> Any:
+    """
+    Responses per hour/day/week in the given IANA time zone, gap-filled.
+    metric: count, sentiment or avg:<rating field id>.
+    """
+    form = db.get(Form, id)
+    if not form:
+        raise HTTPException(status_code=404, detail="Form not found")
+    if form.tenant_id != current_user.tenant_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
 
-class TenantBranding(SQLModel):
-    name: str
-    tagline: Optional[str] = None
-    logo_url: Optional[str] = None
-    logo_position: str = "top-left"
-    primary_color: Optional[str] = "#4F46E5"
-    secondary_color: Optional[str] = "#374151"
-    accent_color: Optional[str] = "#F3F4F6"
-    font_family: Optional[str] = "Inter"
-    address: Optional[str] = None
-    is_branding_approved: bool = False
+    try:
+        return timeseries_service.series(
+            db, _response_filters(id, location_id, None, None),
+            bucket, metric, tz, start_date, end_date, form=form
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-class PublicFormRead(FormBase):
-    id: int
-    tenant: TenantBranding
 
-from fastapi import APIRouter, Depends, HTTPException, Request, BackgroundTasks
+# --- Public Endpoints ---
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Header
 
-# ...
 
-def send_alert_email(form_id: int, sentiment: str, feedback_id: int):
-    # Mock Email Sending (Simulate latency)
-    import time
-    time.sleep(1) 
-    print(f"BACKGROUND TASK: Sending alert email for Feedback {feedback_id} (Form {form_id}). Sentiment: {sentiment}")
+async def _find_submission(db: AsyncSession, form_id: int, key: str) -> Optional[Dict[str, Any]]:
+    result = await db.exec(
+        select(Values.id, Values.sentiment, Values.analysis_status)
+        .where(Values.form_id == form_id)
+        .where(Values.idempotency_key == key)
+    )
+    row = result.first()
+    if not row:
+        return None
+    return {"status": "success", "id": row[0], "sentiment": row[1], "analysis_status": row[2]}
 
-# ... (inside submit_feedback)
+def _rate_limit(plan: Optional[SubscriptionPlan]) -> int:
+    return plan.rate_limit_per_minute if plan else settings.RATE_LIMIT_DEFAULT_PER_MINUTE
 
 @router.post("/public/feedback")
-@limiter.limit("10/minute")
-def submit_feedback(
+async def submit_feedback(
     request: Request,
     feedback: ValuesCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=64),
+    db: AsyncSession = Depends(get_async_session),
 ) -> Any:
-    # ... (existing form check) ...
+    # Throttle before any database work. With the form in the public form
+    # cache its plan's limit applies right away; otherwise a per-form ceiling
+    # guards the lookups below and the plan's limit follows once it's loaded
+    cached_form = public_form_cache.get_by_id(feedback.form_id)
+    if cached_form:
+        request.state.tenant_id = cached_form.tenant_id
+        await limiter.hit(request, "submit", f"form:{feedback.form_id}", cached_form.rate_limit)
+    else:
+        await limiter.hit(request, "submit-ceiling", f"form:{feedback.form_id}", settings.RATE_LIMIT_SUBMIT_CEILING_PER_MINUTE)
+
+    # Retries (double taps, flaky networks) return the original submission
+    key = idempotency_key or feedback.idempotency_key
+    if key:
+        feedback.idempotency_key = key
+        cached = recent_submissions.get((feedback.form_id, key))
+        if cached:
+            return cached
+        existing = await _find_submission(db, feedback.form_id, key)
+        if existing:
+            recent_submissions.put((feedback.form_id, key), existing)
+            return existing
+
     # Verify form exists
-    form = db.get(Form, feedback.form_id)
+    form = await db.get(Form, feedback.form_id)
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
+    request.state.tenant_id = form.tenant_id
         
     # Enforce Plan Limits (Monthly Responses)
     # Ensure tenant/plan loaded
-    tenant = db.get(Tenant, form.tenant_id)
-    if tenant and tenant.plan_id:
-        plan = db.get(SubscriptionPlan, tenant.plan_id)
-        if plan:
-            now = datetime.utcnow()
-            month_start = datetime(now.year, now.month, 1)
-            
-            # Count responses for this tenant this month
-            # Join Values -> Form to filter by Tenant
-            count = db.exec(
-                select(func.count(Values.id))
-                .join(Form)
-                .where(Form.tenant_id == tenant.id)
-                .where(Values.created_at >= month_start)
-            ).one()
-            
-            if count >= plan.max_responses_per_month:
-                 raise HTTPException(status_code=402, detail="Form quota exceeded for this month.")
+    tenant = await db.get(Tenant, form.tenant_id)
+    plan = await db.get(SubscriptionPlan, tenant.plan_id) if tenant and tenant.plan_id else None
+    max_responses = plan.max_responses_per_month if plan else None
+
+    if not cached_form:
+        await limiter.hit(request, "submit", f"form:{form.id}", _rate_limit(plan))
+
+    # Validate against the form fields; ratings etc. are stored as typed values
+    try:
+        feedback.data = validation_service.validate(form, feedback.data)
+    except FormValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
 
+    # Stored as analysis_status="pending"; sentiment is scored (and alerts
+    # sent) by the background sentiment worker, not on the request path
     db_obj = Values.from_orm(feedback)
     
-    # AI Sentiment Analysis
-    text_content = ""
-    if feedback.data:
-        for v in feedback.data.values():
-            if isinstance(v, str):
-                text_content += v + " "
-    
-    sentiment = ai_service.analyze_sentiment(text_content.strip())
-    db_obj.sentiment = sentiment
-    
-    db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    if settings.FEEDBACK_GROUP_COMMIT:
+        # Hand the row to the batch writer; the ID is durable once the batch commits
+        row = db_obj.dict(exclude={"id"})
+        await db.close() # Release the pooled connection while waiting on the batch
+        try:
+            # Shielded: timing out must not cancel a row the flusher may be committing
+            feedback_id = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(feedback_ingest.submit(row, form.tenant_id, max_responses))),
+                timeout=settings.FEEDBACK_BATCH_TIMEOUT_SECONDS
+            )
+        except QuotaExceededError:
+            raise HTTPException(status_code=402, detail="Form quota exceeded for this month.")
+        except DuplicateSubmissionError:
+            existing = await _find_submission(db, feedback.form_id, key) if key else None
+            if not existing:
+                raise HTTPException(status_code=400, detail="Invalid submission")
+            return existing
+        except IntegrityError:
+            raise HTTPException(status_code=400, detail="Invalid submission")
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=503,
+                detail="Feedback may have been saved. Please retry with the same Idempotency-Key."
+            )
+    else:
+        # Bump the monthly usage counter in the same transaction as the insert
+        reserved = await db.run_sync(
+            lambda session: usage_service.reserve_responses(session, form.tenant_id, limit=max_responses)
+        )
+        if not reserved:
+            raise HTTPException(status_code=402, detail="Form quota exceeded for this month.")
+
+        db.add(db_obj)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            # A concurrent retry with the same key won the race
+            existing = await _find_submission(db, feedback.form_id, key) if key else None
+            if not existing:
+                raise HTTPException(status_code=400, detail="Invalid submission")
+            return existing
+        feedback_id = db_obj.id
     
-    # Negative Feedback Alert (Background Task)
-    if sentiment == "negative":
-        background_tasks.add_task(send_alert_email, form.id, sentiment, db_obj.id)
-        
-    return {"status": "success", "id": db_obj.id, "sentiment": sentiment}
+    response = {"status": "success", "id": feedback_id, "sentiment": None, "analysis_status": "pending"}
+    if key:
+        recent_submissions.put((feedback.form_id, key), response)
+    return response
+
+@router.post("/public/feedback/batch", response_model=List[ValuesBatchResult])
+async def submit_feedback_batch(
+    request: Request,
+    items: List[ValuesBatchItem],
+    db: AsyncSession = Depends(get_async_session),
+) -> Any:
+    """
+    Replay responses captured offline (kiosks / mobile clients) in one call.
+    Forms, tenants and quota are resolved once per batch and all new rows are
+    inserted in a single transaction. Items carrying an idempotency key that
+    was already stored are reported as duplicates instead of re-inserted.
+    """
+    if len(items) > settings.FEEDBACK_REPLAY_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.FEEDBACK_REPLAY_MAX_ITEMS} responses per batch.")
+
+    results: List[Optional[ValuesBatchResult]] = [None] * len(items)
+
+    # 1. Resolve forms, tenants and plans once for the whole batch
+    form_ids = {item.form_id for item in items}
+    forms = {f.id: f for f in (await db.exec(select(Form).where(Form.id.in_(form_ids)))).all()}
+    tenant_ids = {f.tenant_id for f in forms.values()}
+    tenants = {t.id: t for t in (await db.exec(select(Tenant).where(Tenant.id.in_(tenant_ids)))).all()}
+    plan_ids = {t.plan_id for t in tenants.values() if t.plan_id}
+    plans = {p.id: p for p in (await db.exec(select(SubscriptionPlan).where(SubscriptionPlan.id.in_(plan_ids)))).all()}
+    for tenant in tenants.values():
+        await limiter.hit(request, "replay", f"tenant:{tenant.id}", _rate_limit(plans.get(tenant.plan_id)))
+
+    # 2. Previously stored idempotency keys
+    keys = {item.idempotency_key for item in items if item.idempotency_key}
+    stored = {}
+    if keys:
+        rows = await db.exec(
+            select(Values.form_id, Values.idempotency_key, Values.id, Values.sentiment)
+            .where(Values.idempotency_key.in_(keys))
+        )
+        stored = {(r[0], r[1]): (r[2], r[3]) for r in rows.all()}
+
+    now = datetime.utcnow()
+    pending: Dict[Tuple[int, str], List[int]] = {} # (tenant_id, month) -> item indexes to insert
+    created: Dict[int, datetime] = {} # index -> created_at to store
+    seen_keys = set()
+    for index, item in enumerate(items):
+        form = forms.get(item.form_id)
+        if not form:
+            results[index] = ValuesBatchResult(index=index, status="rejected", detail="Form not found")
+            continue
+        try:
+            item.data = validation_service.validate(form, item.data)
+        except FormValidationError as e:
+            results[index] = ValuesBatchResult(index=index, status="rejected", detail=str(e))
+            continue
+        key = (item.form_id, item.idempotency_key)
+        if item.idempotency_key:
+            if key in stored:
+                feedback_id, sentiment = stored[key]
+                results[index] = ValuesBatchResult(index=index, status="duplicate", id=feedback_id, sentiment=sentiment)
+                continue
+            if key in seen_keys:
+                results[index] = ValuesBatchResult(index=index, status="duplicate", detail="Repeated within batch")
+                continue
+            seen_keys.add(key)
+        created_at = item.client_created_at or now
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        created[index] = min(created_at, now) # Never trust device clocks ahead of ours
+        pending.setdefault((form.tenant_id, period_key(created[index])), []).append(index)
+
+    # 3. Charge quota once per tenant and month; offline responses count
+    # towards the month they were captured in, like their stored created_at
+    to_insert: List[int] = []
+    for (tenant_id, _), indexes in pending.items():
+        tenant = tenants.get(tenant_id)
+        plan = plans.get(tenant.plan_id) if tenant and tenant.plan_id else None
+        limit = plan.max_responses_per_month if plan else None
+        granted = await db.run_sync(
+            lambda session: usage_service.reserve_available(session, tenant_id, limit, len(indexes), at=created[indexes[0]])
+        )
+        to_insert.extend(indexes[:granted])
+        for index in indexes[granted:]:
+            results[index] = ValuesBatchResult(index=index, status="rejected", detail="Form quota exceeded for this month.")
+
+    # 4. Insert everything in one transaction
+    to_insert.sort()
+    rows = []
+    for index in to_insert:
+        item = items[index]
+        rows.append({
+            "form_id": item.form_id,
+            "location_id": item.location_id,
+            "data": item.data,
+            "idempotency_key": item.idempotency_key,
+            "created_at": created[index],
+            "analysis_status": "pending",
+        })
+
+    if rows:
+        try:
+            inserted = await db.execute(
+                insert(Values).returning(Values.id, sort_by_parameter_order=True), rows
+            )
+            ids = [r[0] for r in inserted]
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Batch conflicted with a concurrent replay. Please retry.")
+
+        for index, feedback_id in zip(to_insert, ids):
+            results[index] = ValuesBatchResult(index=index, status="created", id=feedback_id)
+    else:
+        await db.commit()
+
+    return results
 
 @router.get("/{id}/export", response_class=StreamingResponse)
 def export_feedback_csv(
@@ -344,99 +611,58 @@ def export_feedback_csv(
     location_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet|xlsx)$"),
+    gzip: bool = False,
 ) -> Any:
     """
-    Export feedback to CSV.
+    Export feedback as CSV, NDJSON, Parquet or XLSX (CSV/NDJSON optionally gzipped).
     """
     form = db.get(Form, id)
     if not form:
         raise HTTPException(status_code=404, detail="Form not found")
     if form.tenant_id != current_user.tenant_id:
         raise HTTPException(status_code=403, detail="Not authorized")
+    try:
+        export_service.check_format(format, gzip)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Query logic shared (ideally refactor, but copy-paste for speed now)
-    query = select(Values).where(Values.form_id == id)
-    if location_id:
-        query = query.where(Values.location_id == location_id)
-    if start_date:
-        query = query.where(Values.created_at >= start_date)
-    if end_date:
-        query = query.where(Values.created_at <= end_date)
-    
-    responses = db.exec(query).all()
-    
-    # Determine CSV Headers
-    # Static: ID, Date, Location
-    # Dynamic: Field Labels or IDs
-    
-    field_map = {} # id -> label
-    field_order = []
-    if form.form_schema and "fields" in form.form_schema:
-        for f in form.form_schema["fields"]:
-            fid = f.get("id")
-            label = f.get("label", fid)
-            field_map[fid] = label
-            field_order.append(fid)
-            
-    header = ["ID", "Created At", "Location ID"] + [field_map[fid] for fid in field_order]
-    
-    # Create CSV Stream
-    def iter_csv():
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write BOM for Excel compatibility
-        output.write('\ufeff') 
-        
-        writer.writerow(header)
-        output.seek(0)
-        yield output.read()
-        output.truncate(0)
-        output.seek(0)
-        
-        for r in responses:
-            row = [
-                str(r.id),
-                r.created_at.isoformat(),
-                str(r.location_id or "")
-            ]
-            # Dynamic Data
-            for fid in field_order:
-                val = r.data.get(fid, "")
-                row.append(str(val))
-            
-            writer.writerow(row)
-            output.seek(0)
-            yield output.read()
-            output.truncate(0)
-            output.seek(0)
-            
-    filename = f"export_{form.slug}_{datetime.now().strftime('%Y%m%d')}.csv"
-    
+    # Streamed from a server-side cursor in chunks; never loads the whole result
     return StreamingResponse(
-        iter_csv(),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        export_service.iter_export(form, format, location_id, start_date, end_date, gzip=gzip),
+        media_type=export_service.media_type(format, gzip),
+        headers={"Content-Disposition": f"attachment; filename={export_service.filename(form, format, gzip)}"}
     )
+
 @router.get("/public/{slug}", response_model=PublicFormRead)
-@limiter.limit("5/minute")
-def get_public_form(
+async def get_public_form(
     request: Request,
     slug: str,
-    db: Session = Depends(get_session),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_session),
 ) -> Any:
     """
     Get a specific form by slug (Public Access) with Tenant Branding.
+    Served from the public form cache; supports If-None-Match revalidation.
     """
-    form = db.exec(select(Form).where(Form.slug == slug)).first()
-    if not form:
-        raise HTTPException(status_code=404, detail="Form not found")
-    if not form.is_published:
-         raise HTTPException(status_code=404, detail="Form not active")
-         
-    # Ensure tenant is loaded
-    _ = form.tenant
-    
-    return form
+    cached = public_form_cache.get(slug)
+    if cached is None:
+        # Load tenant eagerly: lazy loads are not available on AsyncSession
+        result = await db.exec(select(Form).where(Form.slug == slug).options(selectinload(Form.tenant)))
+        form = result.first()
+        if not form:
+            raise HTTPException(status_code=404, detail="Form not found")
+        if not form.is_published:
+             raise HTTPException(status_code=404, detail="Form not active")
+
+        plan = await db.get(SubscriptionPlan, form.tenant.plan_id) if form.tenant and form.tenant.plan_id else None
+        body = PublicFormRead.model_validate(form).model_dump_json().encode()
+        cached = public_form_cache.put(slug, body, form.tenant_id, _rate_limit(plan), form_id=form.id)
+    request.state.tenant_id = cached.tenant_id
 
+    await limiter.hit(request, "fetch", f"form:{slug}", cached.rate_limit)
 
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
@@ -15,6 +15,7 @@ from app.models.onboarding import Onboarding, OnboardingStatus
 from app.models.user import User, UserRole
 from app.core.security import get_password_hash
 from app.core.audit import audit_service
+from app.services.admin_overview_service import admin_overview_service
 import secrets
 import string
 
@@ -166,6 +167,7 @@ def convert_lead_to_tenant(
     db.add(lead)
 
     db.commit()
+    admin_overview_service.invalidate()
     
     audit_service.log_action(db=db, user=current_user, action="convert_lead", target_type="lead", target_id=lead.id, details={"tenant_id": tenant.id})
 
@@ -1,5 +1,6 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, Header, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlmodel import Session, select, func
 from app.db.session import get_session
 from app.api import deps
@@ -7,8 +8,9 @@ from app.models.location import Location, LocationCreate, LocationRead, Location
 from app.models.tenant import Tenant
 from app.models.plan import SubscriptionPlan
 from app.models.user import User
-import qrcode
-import io
+from app.models.form import Form
+from app.services.qr_service import qr_service, qr_url, safe_name, QRItem
+from app.core.public_cache import etag_matches
 
 router = APIRouter()
 
@@ -88,6 +90,7 @@ def update_location(
 def get_qr_image(
     id: int,
     form_slug: str,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_session),
     current_user: User = Depends(deps.get_current_user),
 ):
@@ -97,13 +100,53 @@ def get_qr_image(
     if location.tenant_id != current_user.tenant_id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    from app.core.config import settings
-    base_url = settings.FRONTEND_URL
-    url = f"{base_url}/f/{form_slug}?loc={location.id}"
+    url = qr_url(form_slug, location.id)
+    etag = f'"{qr_service.content_hash(url)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=604800"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
     
-    img = qrcode.make(url)
-    buf = io.BytesIO()
-    img.save(buf)
-    buf.seek(0)
-    
-    return Response(content=buf.getvalue(), media_type="image/png")
+    return FileResponse(qr_service.get_png(url), media_type="image/png", headers=headers)
+
+@router.get("/qr_export")
+def export_qr_codes(
+    format: str = Query("zip", pattern="^(zip|pdf)$"),
+    form_id: Optional[int] = None,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+):
+    """
+    Export the QR codes of every location x form of the tenant (or one form)
+    as a ZIP of PNGs or a printable PDF sheet.
+    """
+    locations = db.exec(
+        select(Location).where(Location.tenant_id == current_user.tenant_id).order_by(Location.name)
+    ).all()
+    form_query = select(Form).where(Form.tenant_id == current_user.tenant_id).order_by(Form.title)
+    if form_id:
+        form_query = form_query.where(Form.id == form_id)
+    forms = db.exec(form_query).all()
+
+    items = [
+        QRItem(
+            url=qr_url(form.slug, location.id),
+            filename=f"{safe_name(location.slug)}/{safe_name(form.slug)}.png",
+            title=location.name,
+            subtitle=form.title,
+        )
+        for location in locations for form in forms
+    ]
+    if not items:
+        raise HTTPException(status_code=404, detail="No locations or forms to export")
+
+    if format == "pdf":
+        return Response(
+            content=qr_service.build_pdf(items),
+            media_type="application/pdf",
+            headers={"Content-Disposition": "attachment; filename=qr_codes.pdf"}
+        )
+    return StreamingResponse(
+        qr_service.iter_zip(items),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=qr_codes.zip"}
+    )
@@ -1,5 +1,7 @@
 from typing import Any, Optional, List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 from app.db.session import get_session
 from app.api import deps
@@ -12,6 +14,12 @@ import os
 from fastapi import UploadFile, File
 from app.models.letterhead import LetterheadAsset, LetterheadAssetRead
 from app.services.branding_service import branding_service
+from app.core.public_cache import public_form_cache
+from app.services.snapshot_service import snapshot_service
+from app.services.timeseries_service import timeseries_service
+from app.services.export_service import export_service
+from app.services.admin_overview_service import admin_overview_service
+from app.models.form import Form as FeedbackForm, Values, FeedbackTimeseries
 
 router = APIRouter()
 
@@ -55,6 +63,8 @@ def upgrade_plan(
     db.add(tenant)
     db.commit()
     db.refresh(tenant)
+    public_form_cache.invalidate_tenant(tenant.id) # Plan sets the public rate limit
+    admin_overview_service.invalidate()
     return tenant
 
 class TenantUpdate(BaseModel):
@@ -128,6 +138,7 @@ def create_tenant(
     
     db.commit()
     db.refresh(tenant)
+    admin_overview_service.invalidate()
     
     # 4. Mock Email Service (Log to Console)
     print("----------------------------------------------------------------")
@@ -157,6 +168,49 @@ def read_current_tenant(
         raise HTTPException(status_code=404, detail="Tenant not found")
     return tenant
 
+@router.get("/me/export", response_class=StreamingResponse)
+def export_tenant_data(
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_admin),
+) -> Any:
+    """
+    Export every form's responses, the locations and a schema manifest as one ZIP.
+    """
+    if not current_user.tenant_id:
+        raise HTTPException(status_code=400, detail="User not associated with a tenant")
+    tenant = db.get(Tenant, current_user.tenant_id)
+    if not tenant:
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    # Built while streaming; responses are read in chunks, form by form
+    return StreamingResponse(
+        export_service.iter_tenant_zip(tenant.id),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={export_service.tenant_filename(tenant)}"}
+    )
+
+@router.get("/me/timeseries", response_model=FeedbackTimeseries)
+def get_tenant_timeseries(
+    bucket: str = Query("day", pattern="^(hour|day|week)$"),
+    metric: str = Query("count", pattern="^(count|sentiment)$"),
+    tz: str = "UTC",
+    location_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user: User = Depends(deps.get_current_tenant_user),
+) -> Any:
+    """
+    Responses across all of the tenant's forms per hour/day/week, gap-filled.
+    """
+    filters = [Values.form_id.in_(select(FeedbackForm.id).where(FeedbackForm.tenant_id == current_user.tenant_id))]
+    if location_id:
+        filters.append(Values.location_id == location_id)
+    try:
+        return timeseries_service.series(db, filters, bucket, metric, tz, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.patch("/me", response_model=TenantRead)
 def update_current_tenant(
     tenant_in: TenantUpdate,
@@ -187,6 +241,8 @@ def update_current_tenant(
     db.add(tenant)
     db.commit()
     db.refresh(tenant)
+    public_form_cache.invalidate_tenant(tenant.id)
+    snapshot_service.sync_tenant(db, tenant.id)
     return tenant
 
 @router.post("/me/letterhead", response_model=LetterheadAssetRead)
@@ -294,5 +350,7 @@ def approve_branding(
     db.add(tenant)
     db.commit()
     db.refresh(tenant)
+    public_form_cache.invalidate_tenant(tenant.id)
+    snapshot_service.sync_tenant(db, tenant.id)
     return tenant
 
@@ -0,0 +1,29 @@
+import argparse
+import logging
+from sqlmodel import Session, select
+from app.db.session import engine
+from app.db import base  # noqa: F401
+from app.models.form import Form
+from app.services.snapshot_service import snapshot_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def build(tenant_id: int = None):
+    with Session(engine) as session:
+        query = select(Form).where(Form.is_published == True)
+        if tenant_id:
+            query = query.where(Form.tenant_id == tenant_id)
+        forms = session.exec(query).all()
+        for form in forms:
+            snapshot_service.sync_form(form)
+    logger.info(f"Wrote snapshots for {len(forms)} published form(s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-render static snapshots of published forms")
+    parser.add_argument("--tenant-id", type=int, help="Only rebuild this tenant's forms")
+    args = parser.parse_args()
+    build(args.tenant_id)
+
+if __name__ == "__main__":
+    main()
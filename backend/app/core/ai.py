@@ -1,29 +1,112 @@
-from typing import List
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Lexicon: word -> weight. Matched on whole tokens, so "bad" no longer hits "badge".
+LEXICON: Dict[str, float] = {
+    # Negative
+    'bad': -1.0, 'poor': -1.0, 'terrible': -1.5, 'awful': -1.5, 'horrible': -1.5, 'worst': -2.0,
+    'hate': -1.5, 'slow': -1.0, 'rude': -1.5, 'broken': -1.0, 'dirty': -1.0, 'unfriendly': -1.0,
+    'disappointed': -1.0, 'disappointing': -1.0, 'late': -0.5, 'noisy': -0.5,
+    'expensive': -0.5, 'unhelpful': -1.0,
+    # Positive
+    'good': 1.0, 'great': 1.0, 'excellent': 1.5, 'amazing': 1.5, 'love': 1.5, 'loved': 1.5,
+    'fast': 1.0, 'quick': 1.0, 'friendly': 1.0, 'clean': 1.0, 'best': 1.5, 'helpful': 1.0,
+    'nice': 1.0, 'happy': 1.0, 'polite': 1.0, 'caring': 1.0, 'professional': 0.5, 'thanks': 0.5,
+}
+
+NEGATIONS = frozenset([
+    'not', 'no', 'never', 'none', 'nothing', 'hardly', 'without',
+    'dont', 'didnt', 'doesnt', 'isnt', 'wasnt', 'werent', 'cant', 'couldnt', 'wont', 'wouldnt',
+])
+
+INTENSIFIERS: Dict[str, float] = {
+    'very': 1.5, 'really': 1.5, 'extremely': 2.0, 'so': 1.3, 'too': 1.3, 'super': 1.5,
+    'quite': 1.2, 'incredibly': 2.0, 'absolutely': 1.8, 'slightly': 0.5, 'somewhat': 0.7,
+}
+
+NEGATION_WINDOW = 3 # words
+
+# Words (keeping inner apostrophes) and clause punctuation, in one C-level pass
+TOKEN_RE = re.compile(r"[a-z]+(?:'[a-z]+)?|[.!?;,]")
+
+# Token kinds in the compiled table
+_STOP, _NEGATE, _BOOST, _WORD = range(4)
+
+def compile_lexicon(lexicon: Dict[str, float]) -> Dict[str, tuple]:
+    """
+    Merge lexicon, negations, intensifiers and clause punctuation into one
+    hash table of token -> (kind, value), so each token costs one lookup.
+    """
+    table: Dict[str, tuple] = {}
+    for p in ".!?;,":
+        table[p] = (_STOP, 0.0)
+    for word, weight in lexicon.items():
+        table[word] = (_WORD, weight)
+    for word, factor in INTENSIFIERS.items():
+        table[word] = (_BOOST, factor)
+    for word in NEGATIONS:
+        table[word] = (_NEGATE, 0.0)
+        if word.endswith("nt"):
+            table[word[:-1] + "'t"] = (_NEGATE, 0.0) # didn't, can't, won't...
+    return table
 
 class AIService:
+    def __init__(self, lexicon: Dict[str, float] = LEXICON):
+        self.table = compile_lexicon(lexicon)
+
+    def score(self, text: str) -> float:
+        """
+        Lexicon score of a text. Negation flips the next sentiment word within
+        NEGATION_WINDOW words (reset at clause punctuation); intensifiers
+        directly before a sentiment word scale it.
+        """
+        if not text:
+            return 0.0
+
+        table = self.table
+        tokens = TOKEN_RE.findall(text.lower())
+        hits = [(i, table[t]) for i, t in enumerate(tokens) if t in table]
+
+        total = 0.0
+        negate_left = 0
+        boost = 1.0
+        last = -1
+        for i, (kind, value) in hits:
+            gap = i - last - 1 # Unmatched words since the previous hit
+            last = i
+            if gap:
+                boost = 1.0
+                negate_left = max(negate_left - gap, 0)
+            if kind == _WORD:
+                total += (-value if negate_left else value) * boost
+                negate_left = 0
+                boost = 1.0
+            elif kind == _NEGATE:
+                negate_left = NEGATION_WINDOW
+            elif kind == _BOOST:
+                boost *= value
+            else:
+                negate_left = 0
+                boost = 1.0
+        return total
+
     def analyze_sentiment(self, text: str) -> str:
         """
         Analyze sentiment of text.
         Returns: 'positive', 'negative', or 'neutral'.
         """
-        if not text:
-            return "neutral"
-            
-        # Simple heuristic for demo
-        negative_words = ['bad', 'poor', 'terrible', 'awful', 'hate', 'slow', 'rude', 'broken', 'dirty']
-        positive_words = ['good', 'great', 'excellent', 'love', 'fast', 'friendly', 'clean', 'best']
-        
-        text_lower = text.lower()
-        score = 0
-        for w in positive_words:
-            if w in text_lower: score += 1
-        for w in negative_words:
-            if w in text_lower: score -= 1
-            
+        score = self.score(text)
         if score > 0: return "positive"
         if score < 0: return "negative"
         return "neutral"
 
+    def analyze_batch(self, texts: Iterable[str]) -> List[str]:
+        """
+        Score many texts in one call (e.g. re-scoring historical responses).
+        """
+        analyze = self.analyze_sentiment
+        return [analyze(t) for t in texts]
+
     def generate_summary(self, texts: List[str]) -> str:
         if not texts: return "No feedback to summarize."
         # Mock summary
@@ -32,3 +115,17 @@ class AIService:
         return f"AI Summary: Analyzed {count} responses. Key topics include: {', '.join(sample)}..."
 
 ai_service = AIService()
+
+def analyze_batch(texts: List[str]) -> List[str]:
+    """
+    Module-level entry point so worker processes can score without pickling the service.
+    """
+    return ai_service.analyze_batch(texts)
+
+def feedback_text(data: Optional[Dict[str, Any]]) -> str:
+    """
+    Concatenate the free-text answers of a response for sentiment analysis.
+    """
+    if not data:
+        return ""
+    return " ".join(v for v in data.values() if isinstance(v, str)).strip()
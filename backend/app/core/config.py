@@ -18,6 +18,78 @@ class Settings(BaseSettings):
             return v.replace("postgres://", "postgresql://", 1)
         return v
 
+    # Disable only for local load testing
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE_URL: str = "memory://" # file:///path/ratelimit.db or redis://host:6379/0 to share buckets across workers
+    RATE_LIMIT_DEFAULT_PER_MINUTE: int = 30 # Tenants without a plan
+    RATE_LIMIT_SUBMIT_CEILING_PER_MINUTE: int = 300 # Per form and IP before the form is loaded; keep above every plan's limit
+
+    # Request metrics (GET /metrics, admin usage/health views)
+    METRICS_STORAGE_URL: str = "memory://" # file:///path/metrics.db or redis://host:6379/0 to aggregate all workers
+    METRICS_FLUSH_SECONDS: float = 5.0
+    METRICS_AUTH_TOKEN: Optional[str] = None # /metrics requires "Authorization: Bearer <token>"; disabled while unset
+
+    # Public feedback ingestion
+    # Group commit: queue submissions in-process and insert them in batches
+    FEEDBACK_GROUP_COMMIT: bool = False
+    FEEDBACK_BATCH_SIZE: int = 200
+    FEEDBACK_BATCH_INTERVAL_MS: int = 25
+    FEEDBACK_BATCH_TIMEOUT_SECONDS: float = 10.0
+    # Max responses per offline replay (POST /forms/public/feedback/batch)
+    FEEDBACK_REPLAY_MAX_ITEMS: int = 500
+    # Recent idempotency keys answered from memory
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    # Compiled submission validators, one per (form, schema version)
+    FORM_VALIDATOR_CACHE_SIZE: int = 1024
+    # Serialized GET /forms/public/{slug} payloads (bounds staleness across workers)
+    PUBLIC_FORM_CACHE_TTL_SECONDS: float = 300.0
+    # Static snapshots of published forms, served at /snapshots
+    SNAPSHOT_DIR: str = "uploads/snapshots"
+    SNAPSHOT_KEEP_VERSIONS: int = 3
+    # Content-addressed QR PNG cache and bulk export rendering
+    QR_CACHE_DIR: str = "cache/qr"
+    QR_RENDER_PROCESSES: int = 2
+
+    # Background sentiment scoring
+    SENTIMENT_WORKER_IN_PROCESS: bool = True # Run the worker loop inside the API process
+    SENTIMENT_WORKER_PROCESSES: int = 2 # 0 scores in the worker thread itself
+    SENTIMENT_WORKER_BATCH_SIZE: int = 500
+    SENTIMENT_WORKER_POLL_SECONDS: float = 2.0
+    SENTIMENT_CLAIM_TIMEOUT_SECONDS: float = 300.0 # Claimed rows of a worker that died go back to the queue
+
+    # Daily feedback rollup read by the stats and usage views
+    ROLLUP_WORKER_IN_PROCESS: bool = True
+    ROLLUP_INTERVAL_SECONDS: float = 300.0
+    ROLLUP_SETTLE_SECONDS: float = 60.0 # Longer than any submit/replay transaction
+    # Points per GET /forms/{id}/timeseries request
+    TIMESERIES_MAX_BUCKETS: int = 2000
+    # Cached super admin overview (GET /admin/overview)
+    ADMIN_OVERVIEW_TTL_SECONDS: float = 30.0
+    # GET /forms/{id}/responses/changes only returns changes at least this old,
+    # so writes still committing (or app servers with slightly skewed clocks)
+    # can't land behind a cursor that was already handed out
+    RESPONSE_CHANGES_SETTLE_SECONDS: float = 5.0
+    # Rows fetched (server-side cursor) and written per chunk in exports
+    EXPORT_CHUNK_ROWS: int = 5000
+    # Background export jobs (POST /exports), files kept for download
+    EXPORT_DIR: str = "exports"
+    EXPORT_WORKER_IN_PROCESS: bool = True
+    EXPORT_WORKER_POLL_SECONDS: float = 2.0
+    EXPORT_JOB_STALE_SECONDS: float = 300.0 # Running jobs without a heartbeat this long are picked up again
+    EXPORT_RETENTION_HOURS: float = 24.0
+
+    # Negative-feedback alert emails
+    # Without SMTP_HOST alerts are only logged; point it at a local stand-in
+    # (e.g. `python -m aiosmtpd -n -l localhost:1025`) to test delivery
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 25
+    SMTP_USER: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = False
+    ALERTS_FROM_EMAIL: str = "alerts@qrfeedback.local"
+    ALERT_COALESCE_SECONDS: float = 120.0
+    ALERT_MAX_CONCURRENT_SENDS: int = 4
+
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
 
     @validator("BACKEND_CORS_ORIGINS", pre=True)
@@ -0,0 +1,41 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from app.core.config import settings
+
+class RecentKeyCache:
+    """
+    Bounded, thread-safe LRU of recently stored idempotency keys, so client
+    retries are answered without a database round trip. The unique index on
+    (form_id, idempotency_key) remains the source of truth across workers.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+
+    def update(self, key: Hashable, **changes: Any) -> None:
+        """
+        Patch a cached entry in place (no-op if it was evicted).
+        """
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                value.update(changes)
+
+recent_submissions = RecentKeyCache(settings.IDEMPOTENCY_CACHE_SIZE)
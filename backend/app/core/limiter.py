@@ -1,5 +1,218 @@
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlparse
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
 
-limiter = Limiter(key_func=get_remote_address, default_limits=["200/minute"])
+# --- Storage backends ---
+# Each backend implements an atomic token-bucket take plus simple counters.
+# take() returns (allowed, seconds until a token is available).
+
+class MemoryStorage:
+    """
+    Per-process storage. Fine for a single worker or local development.
+    """
+    is_local = True
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, capacity: float) -> Tuple[bool, float]:
+        now = time.time()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                return True, 0.0
+            self._buckets[key] = (tokens, now)
+            return False, (1 - tokens) / rate
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+
+    def get_counts(self, names: Iterable[str]) -> List[int]:
+        with self._lock:
+            return [self._counters.get(n, 0) for n in names]
+
+class FileStorage:
+    """
+    Local-file stand-in for a shared store: a SQLite database that every
+    uvicorn worker on the host opens. BEGIN IMMEDIATE serializes updates.
+    """
+    is_local = False
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rate: float, capacity: float) -> Tuple[bool, float]:
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def incr(self, name: str) -> None:
+        self._connect().execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get_counts(self, names: Iterable[str]) -> List[int]:
+        names = list(names)
+        rows = self._connect().execute(
+            f"SELECT name, value FROM counters WHERE name IN ({','.join('?' * len(names))})", names
+        ).fetchall()
+        values = dict(rows)
+        return [values.get(n, 0) for n in names]
+
+# Atomic token bucket in Redis: KEYS[1]=bucket, ARGV=rate, capacity, now
+_REDIS_TAKE = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+class RedisStorage:
+    """
+    Shared storage for any Redis-protocol server (Redis, Valkey, KeyDB...).
+    Requires the optional `redis` package.
+    """
+    is_local = False
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_STORAGE_URL points to Redis but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self._take = self.client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, rate: float, capacity: float) -> Tuple[bool, float]:
+        allowed, tokens = self._take(keys=[f"ratelimit:{key}"], args=[rate, capacity, time.time()])
+        tokens = float(tokens)
+        return bool(allowed), 0.0 if allowed else (1 - tokens) / rate
+
+    def incr(self, name: str) -> None:
+        pipe = self.client.pipeline()
+        pipe.incr(f"ratelimit:counter:{name}")
+        pipe.expire(f"ratelimit:counter:{name}", 60 * 60 * 48)
+        pipe.execute()
+
+    def get_counts(self, names: Iterable[str]) -> List[int]:
+        values = self.client.mget([f"ratelimit:counter:{n}" for n in names])
+        return [int(v) if v else 0 for v in values]
+
+def get_storage(url: str):
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisStorage(url)
+    if parsed.scheme == "file":
+        path = parsed.path or "ratelimit.db"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return FileStorage(path)
+    return MemoryStorage()
+
+# --- Limiter ---
+
+class RateLimiter:
+    """
+    Token-bucket limiter for the public endpoints.
+
+    Buckets are keyed by (scope, form or tenant, client IP) so one busy site
+    behind a NAT doesn't starve others, and sized from the tenant's
+    SubscriptionPlan.rate_limit_per_minute. Rejections are counted per hour
+    in the same shared storage so all workers report the same totals.
+    """
+
+    def __init__(self, storage, enabled: bool = True):
+        self.storage = storage
+        self.enabled = enabled
+
+    @staticmethod
+    def client_id(request: Request) -> str:
+        return request.client.host if request.client else "unknown"
+
+    async def hit(self, request: Request, scope: str, target: str, per_minute: int) -> None:
+        """
+        Take one token or raise 429 with a Retry-After header.
+        """
+        if not self.enabled or per_minute <= 0:
+            return
+        key = f"{scope}:{target}:{self.client_id(request)}"
+        rate = per_minute / 60.0
+        if self.storage.is_local:
+            allowed, retry_after = self.storage.take(key, rate, per_minute)
+        else:
+            allowed, retry_after = await run_in_threadpool(self.storage.take, key, rate, per_minute)
+        if allowed:
+            return
+
+        counter = self._trigger_counter(datetime.utcnow())
+        if self.storage.is_local:
+            self.storage.incr(counter)
+        else:
+            await run_in_threadpool(self.storage.incr, counter)
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded: {per_minute} per 1 minute",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    @staticmethod
+    def _trigger_counter(at: datetime) -> str:
+        return f"triggers:{at.strftime('%Y%m%d%H')}"
+
+    def trigger_count(self, hours: int = 24) -> int:
+        """
+        Number of rejected requests over the last `hours`, across all workers.
+        """
+        now = datetime.utcnow()
+        names = [self._trigger_counter(now - timedelta(hours=h)) for h in range(hours)]
+        return sum(self.storage.get_counts(names))
+
+limiter = RateLimiter(get_storage(settings.RATE_LIMIT_STORAGE_URL), enabled=settings.RATE_LIMIT_ENABLED)
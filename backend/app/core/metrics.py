@@ -0,0 +1,421 @@
+import bisect
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from starlette.routing import Mount
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bounds in seconds (Prometheus client defaults)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_LE = [repr(b) for b in BUCKETS] + ["+Inf"]
+
+WINDOW_SECONDS = 60 # Granularity of the request/error windows behind the admin views
+WINDOW_RETENTION_SECONDS = 25 * 3600
+
+# family -> (type, help)
+FAMILIES = {
+    "http_requests_total": ("counter", "HTTP requests by route template, status class and tenant."),
+    "http_request_duration_seconds": ("histogram", "HTTP request duration by route template and status class."),
+    "http_tenant_request_duration_seconds": ("histogram", "HTTP request duration by tenant."),
+    "http_request_ttfb_seconds": ("histogram", "Time until the response headers were sent, by route template and status class."),
+    "http_response_bytes_total": ("counter", "Response body bytes sent by route template, status class and tenant."),
+}
+
+Sample = Tuple[str, str] # (sample name, rendered labels)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def render_labels(**labels: str) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items() if v)
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _with_le(labels: str, le: str) -> str:
+    return f'{labels},le="{le}"' if labels else f'le="{le}"'
+
+def route_template(scope: dict) -> str:
+    """
+    Path template of the route that handled the request ("unmatched" for
+    404s, so scanners can't blow up the label set).
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    if isinstance(route, Mount):
+        return route.path + "/{path}"
+    # Routes of an included router may report a path relative to its prefix;
+    # take the prefix from the request path (templates have no :path params)
+    template = route.path
+    segments = scope["path"].split("/")
+    return "/".join(segments[:len(segments) - template.count("/")]) + template
+
+# --- Storage backends ---
+# Each backend adds a batch of deltas atomically: cumulative samples, per-minute
+# windows and a heartbeat for the flushing worker.
+
+class MemoryMetricsStorage:
+    """
+    Per-process storage. Fine for a single worker or local development.
+    """
+    is_local = True
+
+    def __init__(self):
+        self._samples: Dict[Sample, float] = {}
+        self._windows: Dict[Tuple[str, int], float] = {}
+        self._workers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, worker: str, samples: Dict[Sample, float], windows: Dict[Tuple[str, int], float], now: float) -> None:
+        cutoff = now - WINDOW_RETENTION_SECONDS
+        with self._lock:
+            for key, value in samples.items():
+                self._samples[key] = self._samples.get(key, 0) + value
+            for key, value in windows.items():
+                self._windows[key] = self._windows.get(key, 0) + value
+            self._workers[worker] = now
+            for key in [k for k in self._windows if k[1] < cutoff]:
+                del self._windows[key]
+
+    def samples(self) -> Dict[Sample, float]:
+        with self._lock:
+            return dict(self._samples)
+
+    def window_total(self, name: str, start: float, end: float) -> float:
+        with self._lock:
+            return sum(v for (n, bucket), v in self._windows.items() if n == name and start <= bucket < end)
+
+    def workers(self, since: float) -> int:
+        with self._lock:
+            return sum(1 for seen in self._workers.values() if seen >= since)
+
+class FileMetricsStorage:
+    """
+    SQLite file shared by every uvicorn worker on the host (same approach as
+    the rate limiter's FileStorage). Workers write one transaction per flush.
+    """
+    is_local = False
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS samples (name TEXT, labels TEXT, value REAL, PRIMARY KEY (name, labels))")
+        conn.execute("CREATE TABLE IF NOT EXISTS windows (name TEXT, bucket INTEGER, value REAL, PRIMARY KEY (name, bucket))")
+        conn.execute("CREATE TABLE IF NOT EXISTS workers (id TEXT PRIMARY KEY, seen REAL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, worker: str, samples: Dict[Sample, float], windows: Dict[Tuple[str, int], float], now: float) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO samples (name, labels, value) VALUES (?, ?, ?) "
+                "ON CONFLICT(name, labels) DO UPDATE SET value = value + excluded.value",
+                [(name, labels, value) for (name, labels), value in samples.items()]
+            )
+            conn.executemany(
+                "INSERT INTO windows (name, bucket, value) VALUES (?, ?, ?) "
+                "ON CONFLICT(name, bucket) DO UPDATE SET value = value + excluded.value",
+                [(name, bucket, value) for (name, bucket), value in windows.items()]
+            )
+            conn.execute("INSERT OR REPLACE INTO workers (id, seen) VALUES (?, ?)", (worker, now))
+            conn.execute("DELETE FROM windows WHERE bucket < ?", (now - WINDOW_RETENTION_SECONDS,))
+            conn.execute("DELETE FROM workers WHERE seen < ?", (now - 86400,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def samples(self) -> Dict[Sample, float]:
+        rows = self._connect().execute("SELECT name, labels, value FROM samples").fetchall()
+        return {(name, labels): value for name, labels, value in rows}
+
+    def window_total(self, name: str, start: float, end: float) -> float:
+        row = self._connect().execute(
+            "SELECT SUM(value) FROM windows WHERE name = ? AND bucket >= ? AND bucket < ?", (name, start, end)
+        ).fetchone()
+        return row[0] or 0
+
+    def workers(self, since: float) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM workers WHERE seen >= ?", (since,)).fetchone()[0]
+
+class RedisMetricsStorage:
+    """
+    Shared storage for any Redis-protocol server, for workers on several hosts.
+    Requires the optional `redis` package.
+    """
+    is_local = False
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("METRICS_STORAGE_URL points to Redis but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+
+    def add(self, worker: str, samples: Dict[Sample, float], windows: Dict[Tuple[str, int], float], now: float) -> None:
+        pipe = self.client.pipeline()
+        for (name, labels), value in samples.items():
+            # Rendered labels escape newlines, so "\n" separates unambiguously
+            pipe.hincrbyfloat("metrics:samples", f"{name}\n{labels}", value)
+        for (name, bucket), value in windows.items():
+            pipe.incrbyfloat(f"metrics:window:{name}:{bucket}", value)
+            pipe.expire(f"metrics:window:{name}:{bucket}", WINDOW_RETENTION_SECONDS)
+        pipe.zadd("metrics:workers", {worker: now})
+        pipe.zremrangebyscore("metrics:workers", 0, now - 86400)
+        pipe.execute()
+
+    def samples(self) -> Dict[Sample, float]:
+        result = {}
+        for field, value in self.client.hgetall("metrics:samples").items():
+            name, labels = field.decode().split("\n", 1)
+            result[(name, labels)] = float(value)
+        return result
+
+    def window_total(self, name: str, start: float, end: float) -> float:
+        buckets = range(int(start) // WINDOW_SECONDS * WINDOW_SECONDS, int(end), WINDOW_SECONDS)
+        values = self.client.mget([f"metrics:window:{name}:{b}" for b in buckets]) if buckets else []
+        return sum(float(v) for v in values if v)
+
+    def workers(self, since: float) -> int:
+        return self.client.zcount("metrics:workers", since, "+inf")
+
+def get_metrics_storage(url: str):
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisMetricsStorage(url)
+    if parsed.scheme == "file":
+        path = parsed.path or "metrics.db"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return FileMetricsStorage(path)
+    return MemoryMetricsStorage()
+
+# --- Registry ---
+
+class MetricsRegistry:
+    """
+    HTTP request counters and latency histograms, fed by MonitoringMiddleware.
+
+    Observations are a few dict increments in the worker's memory; a
+    background thread flushes the deltas to the shared storage every
+    METRICS_FLUSH_SECONDS, so `/metrics` and the admin views report totals
+    across all workers (other workers lag by at most one flush interval).
+    Per-minute request and 5xx windows back requests_per_minute and
+    error_rate, and each flush doubles as the worker's heartbeat.
+    """
+
+    def __init__(self, storage, flush_seconds: float):
+        self.storage = storage
+        self.flush_seconds = flush_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        # (method, route, status class, tenant, bucket index) -> count
+        self._counts: Dict[Tuple[str, str, str, str, int], int] = {}
+        # (method, route, status class, tenant) -> seconds
+        self._durations: Dict[Tuple[str, str, str, str], float] = {}
+        # (method, route, status class, tenant) -> body bytes
+        self._bytes: Dict[Tuple[str, str, str, str], int] = {}
+        # (method, route, status class, bucket index) -> count, and -> seconds
+        self._ttfb_counts: Dict[Tuple[str, str, str, int], int] = {}
+        self._ttfb: Dict[Tuple[str, str, str], float] = {}
+        # (window name, minute start) -> count
+        self._windows: Dict[Tuple[str, int], float] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def observe_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        tenant_id: Optional[int],
+        duration: float,
+        ttfb: Optional[float] = None,
+        bytes_sent: int = 0,
+    ) -> None:
+        """
+        Record one request. `ttfb` is None when no response was started.
+        """
+        status = f"{status_code // 100}xx"
+        key = (method, route, status, str(tenant_id) if tenant_id else "")
+        index = bisect.bisect_left(BUCKETS, duration)
+        minute = int(time.time()) // WINDOW_SECONDS * WINDOW_SECONDS
+        with self._lock:
+            count_key = key + (index,)
+            self._counts[count_key] = self._counts.get(count_key, 0) + 1
+            self._durations[key] = self._durations.get(key, 0.0) + duration
+            if bytes_sent:
+                self._bytes[key] = self._bytes.get(key, 0) + bytes_sent
+            if ttfb is not None:
+                ttfb_key = (method, route, status, bisect.bisect_left(BUCKETS, ttfb))
+                self._ttfb_counts[ttfb_key] = self._ttfb_counts.get(ttfb_key, 0) + 1
+                self._ttfb[key[:3]] = self._ttfb.get(key[:3], 0.0) + ttfb
+            self._windows[("requests", minute)] = self._windows.get(("requests", minute), 0) + 1
+            if status_code >= 500:
+                self._windows[("errors", minute)] = self._windows.get(("errors", minute), 0) + 1
+
+    def _expand(self, counts, durations, sizes, ttfb_counts, ttfb) -> Dict[Sample, float]:
+        """
+        Pending observations as storage samples (histogram buckets are kept
+        non-cumulative and summed up when rendered).
+        """
+        samples: Dict[Sample, float] = {}
+
+        def add(name: str, labels: str, value: float) -> None:
+            samples[(name, labels)] = samples.get((name, labels), 0) + value
+
+        for (method, route, status, tenant, index), n in counts.items():
+            route_labels = render_labels(method=method, route=route, status=status)
+            add("http_requests_total", render_labels(method=method, route=route, status=status, tenant=tenant), n)
+            add("http_request_duration_seconds_bucket", _with_le(route_labels, _LE[index]), n)
+            add("http_request_duration_seconds_count", route_labels, n)
+            if tenant:
+                tenant_labels = render_labels(tenant=tenant)
+                add("http_tenant_request_duration_seconds_bucket", _with_le(tenant_labels, _LE[index]), n)
+                add("http_tenant_request_duration_seconds_count", tenant_labels, n)
+        for (method, route, status, tenant), seconds in durations.items():
+            add("http_request_duration_seconds_sum", render_labels(method=method, route=route, status=status), seconds)
+            if tenant:
+                add("http_tenant_request_duration_seconds_sum", render_labels(tenant=tenant), seconds)
+        for (method, route, status, tenant), n in sizes.items():
+            add("http_response_bytes_total", render_labels(method=method, route=route, status=status, tenant=tenant), n)
+        for (method, route, status, index), n in ttfb_counts.items():
+            route_labels = render_labels(method=method, route=route, status=status)
+            add("http_request_ttfb_seconds_bucket", _with_le(route_labels, _LE[index]), n)
+            add("http_request_ttfb_seconds_count", route_labels, n)
+        for (method, route, status), seconds in ttfb.items():
+            add("http_request_ttfb_seconds_sum", render_labels(method=method, route=route, status=status), seconds)
+        return samples
+
+    _PENDING = ("_counts", "_durations", "_bytes", "_ttfb_counts", "_ttfb", "_windows")
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                pending = {name: getattr(self, name) for name in self._PENDING}
+                for name in self._PENDING:
+                    setattr(self, name, {})
+            try:
+                samples = self._expand(
+                    pending["_counts"], pending["_durations"], pending["_bytes"], pending["_ttfb_counts"], pending["_ttfb"]
+                )
+                self.storage.add(self.worker_id, samples, pending["_windows"], time.time())
+            except Exception:
+                # Keep the deltas for the next flush
+                with self._lock:
+                    for name, values in pending.items():
+                        store = getattr(self, name)
+                        for key, value in values.items():
+                            store[key] = store.get(key, 0) + value
+                raise
+
+    def render(self) -> str:
+        """
+        All workers' metrics in the Prometheus text exposition format.
+        """
+        self.flush()
+        families: Dict[str, list] = {}
+        for (name, labels), value in self.storage.samples().items():
+            family = name
+            for suffix in ("_bucket", "_sum", "_count"):
+                if name.endswith(suffix) and name[:-len(suffix)] in FAMILIES:
+                    family = name[:-len(suffix)]
+            families.setdefault(family, []).append((name, labels, value))
+
+        lines = []
+        for family, samples in sorted(families.items()):
+            kind, help = FAMILIES.get(family, ("untyped", ""))
+            lines.append(f"# HELP {family} {help}")
+            lines.append(f"# TYPE {family} {kind}")
+            if kind != "histogram":
+                for name, labels, value in sorted(samples):
+                    lines.append(f"{name}{{{labels}}} {_format(value)}" if labels else f"{name} {_format(value)}")
+                continue
+
+            # Group by series, then emit cumulative buckets, _sum and _count
+            series: Dict[str, Dict[str, float]] = {}
+            for name, labels, value in samples:
+                if name.endswith("_bucket"):
+                    base, le = labels.rsplit('le="', 1)
+                    series.setdefault(base.rstrip(","), {})[le.rstrip('"')] = value
+                else:
+                    series.setdefault(labels, {})[name[len(family):]] = value
+            for labels, values in sorted(series.items()):
+                cumulative = 0.0
+                for le in _LE:
+                    cumulative += values.get(le, 0)
+                    lines.append(f"{family}_bucket{{{_with_le(labels, le)}}} {_format(cumulative)}")
+                for suffix in ("_sum", "_count"):
+                    value = values.get(suffix, 0)
+                    lines.append(f"{family}{suffix}{{{labels}}} {_format(value)}" if labels else f"{family}{suffix} {_format(value)}")
+        return "\n".join(lines) + "\n"
+
+    def requests_per_minute(self, minutes: int = 5) -> float:
+        """
+        Average over the last `minutes` complete minutes, across all workers.
+        """
+        self.flush()
+        end = int(time.time()) // WINDOW_SECONDS * WINDOW_SECONDS
+        return self.storage.window_total("requests", end - minutes * WINDOW_SECONDS, end) / minutes
+
+    def error_rate(self, hours: int = 24) -> float:
+        """
+        Share of requests answered with a 5xx over the last `hours` (0..1).
+        """
+        self.flush()
+        now = time.time()
+        start = now - hours * 3600
+        requests = self.storage.window_total("requests", start, now + WINDOW_SECONDS)
+        if not requests:
+            return 0.0
+        return self.storage.window_total("errors", start, now + WINDOW_SECONDS) / requests
+
+    def active_workers(self) -> int:
+        """
+        Workers that flushed within the last few intervals.
+        """
+        self.flush()
+        return self.storage.workers(time.time() - max(3 * self.flush_seconds, 30))
+
+    def run_forever(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Metrics flush failed: {e}", exc_info=True)
+
+    def start(self) -> None:
+        # Per-process storage is read directly; nothing to flush in the background
+        if self.storage.is_local or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="metrics-flush", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_seconds + 5)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Metrics flush failed: {e}", exc_info=True)
+
+metrics = MetricsRegistry(get_metrics_storage(settings.METRICS_STORAGE_URL), settings.METRICS_FLUSH_SECONDS)
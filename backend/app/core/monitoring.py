@@ -1,8 +1,8 @@
 import time
 import logging
 import json
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import metrics, route_template
 
 # Configure Centralized Logger
 logging.basicConfig(
@@ -11,44 +11,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger("saas.observability")
 
-class MonitoringMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        path = request.url.path
-        method = request.method
-        client_ip = request.client.host if request.client else "unknown"
-        
+class MonitoringMiddleware:
+    """
+    Request logging and metrics as a plain ASGI middleware.
+
+    Only `send` is wrapped to observe the status, body bytes and the time
+    the headers went out; the response body passes through untouched, so
+    streamed exports and background tasks behave as without the middleware.
+    Durations use the monotonic clock and run until the last body chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500 # Unless a response is started
+        ttfb = None
+        bytes_sent = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, ttfb, bytes_sent
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                ttfb = time.perf_counter() - start
+            elif message["type"] == "http.response.body":
+                bytes_sent += len(message.get("body", b""))
+            await send(message)
+
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Error Tracking
-            status_code = 500
             logger.error(json.dumps({
                 "event": "error",
                 "message": str(e),
-                "path": path,
-                "method": method
+                "path": scope["path"],
+                "method": scope["method"]
             }), exc_info=True)
-            raise e
+            raise
         finally:
             # API Latency & Metrics
-            process_time = time.time() - start_time
-            duration_ms = round(process_time * 1000, 2)
-            
+            duration = time.perf_counter() - start
+            path = scope["path"]
+
+            # Route template, not the raw path, to keep label cardinality bounded
+            tenant_id = scope.get("state", {}).get("tenant_id") # Set via request.state by auth and public endpoints
+            metrics.observe_request(
+                scope["method"], route_template(scope), status_code, tenant_id, duration,
+                ttfb=ttfb, bytes_sent=bytes_sent,
+            )
+
+            client = scope.get("client")
             log_payload = {
                 "event": "request_completed",
-                "method": method,
+                "method": scope["method"],
                 "path": path,
                 "status_code": status_code,
-                "duration_ms": duration_ms,
-                "client_ip": client_ip
+                "duration_ms": round(duration * 1000, 2),
+                "ttfb_ms": round(ttfb * 1000, 2) if ttfb is not None else None,
+                "bytes_sent": bytes_sent,
+                "client_ip": client[0] if client else "unknown"
             }
-            
+
             # Public Endpoint Metrics Tagging
             if "/public/" in path:
                 log_payload["metric_type"] = "public_usage"
-            
+
             logger.info(json.dumps(log_payload))
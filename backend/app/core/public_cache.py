@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+from app.core.config import settings
+
+@dataclass
+class CachedForm:
+    body: bytes # Serialized PublicFormRead
+    etag: str
+    tenant_id: int
+    rate_limit: int
+    expires_at: float
+    form_id: Optional[int] = None
+
+class PublicFormCache:
+    """
+    Pre-serialized public form payloads keyed by slug.
+
+    Entries are dropped by the endpoints that change a form or its tenant's
+    branding. That only reaches the current worker, so entries also expire
+    after PUBLIC_FORM_CACHE_TTL_SECONDS to bound staleness elsewhere.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: Dict[str, CachedForm] = {}
+        self._by_tenant: Dict[int, Set[str]] = {}
+        self._by_id: Dict[int, str] = {} # form id -> slug
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    def get(self, slug: str) -> Optional[CachedForm]:
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry and entry.expires_at < time.monotonic():
+                self._drop(slug)
+                entry = None
+            if entry:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def get_by_id(self, form_id: int) -> Optional[CachedForm]:
+        """
+        Entry of a form by ID (submissions carry the ID, not the slug).
+        Doesn't count towards the hit/miss stats.
+        """
+        with self._lock:
+            slug = self._by_id.get(form_id)
+            entry = self._entries.get(slug) if slug else None
+            if entry and entry.expires_at < time.monotonic():
+                self._drop(slug)
+                entry = None
+            return entry
+
+    def put(self, slug: str, body: bytes, tenant_id: int, rate_limit: int, form_id: Optional[int] = None) -> CachedForm:
+        entry = CachedForm(
+            body=body,
+            etag=self.make_etag(body),
+            tenant_id=tenant_id,
+            rate_limit=rate_limit,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            form_id=form_id,
+        )
+        with self._lock:
+            self._drop(slug)
+            self._entries[slug] = entry
+            self._by_tenant.setdefault(tenant_id, set()).add(slug)
+            if form_id is not None:
+                self._by_id[form_id] = slug
+        return entry
+
+    def invalidate(self, *slugs: str) -> None:
+        with self._lock:
+            for slug in slugs:
+                if self._drop(slug):
+                    self.invalidations += 1
+
+    def invalidate_tenant(self, tenant_id: int) -> None:
+        """
+        Drop every form of a tenant (branding and plan are part of the payload).
+        """
+        with self._lock:
+            for slug in list(self._by_tenant.get(tenant_id, ())):
+                if self._drop(slug):
+                    self.invalidations += 1
+
+    def _drop(self, slug: str) -> bool:
+        entry = self._entries.pop(slug, None)
+        if entry:
+            if entry.form_id is not None and self._by_id.get(entry.form_id) == slug:
+                del self._by_id[entry.form_id]
+            slugs = self._by_tenant.get(entry.tenant_id)
+            if slugs:
+                slugs.discard(slug)
+                if not slugs:
+                    del self._by_tenant[entry.tenant_id]
+        return entry is not None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    return etag in (t.strip().removeprefix("W/") for t in if_none_match.split(","))
+
+public_form_cache = PublicFormCache(settings.PUBLIC_FORM_CACHE_TTL_SECONDS)
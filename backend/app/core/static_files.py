@@ -0,0 +1,36 @@
+import mimetypes
+import os
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves `<file>.gz` with Content-Encoding: gzip when the
+    client accepts it. Files named `current.*` are revalidated on every use;
+    everything else is content-addressed and cached as immutable.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            try:
+                response = await super().get_response(path + ".gz", scope)
+            except HTTPException:
+                response = None
+            if response is not None:
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                response.headers["Content-Type"] = media_type
+                response.headers["Content-Encoding"] = "gzip"
+                return self._cache_headers(path, response)
+        return self._cache_headers(path, await super().get_response(path, scope))
+
+    @staticmethod
+    def _cache_headers(path: str, response: Response) -> Response:
+        response.headers["Vary"] = "Accept-Encoding"
+        if os.path.basename(path).startswith("current."):
+            response.headers["Cache-Control"] = "no-cache"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
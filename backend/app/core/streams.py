@@ -0,0 +1,39 @@
+import io
+import zlib
+from typing import Iterable, Iterator, List, Union
+
+class ChunkBuffer(io.RawIOBase):
+    """
+    Write-only sink for writers that want a file (zipfile, pyarrow) so the
+    bytes can be handed out as they are produced.
+    """
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+def gzip_stream(chunks: Iterable[Union[str, bytes]], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip a stream of chunks on the fly (str chunks are UTF-8 encoded).
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31) # 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -11,5 +11,8 @@ from app.models.setting import SystemSetting
 from app.models.lead import Lead
 from app.models.onboarding import Onboarding
 from app.models.task import FleeterTask
+from app.models.usage import TenantUsageCounter
+from app.models.rollup import FeedbackRollup, RollupWatermark
+from app.models.export import ExportJob
 
 # This file is imported by Alembic's env.py
@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+from sqlalchemy import Date, Float, case, cast, func, literal
+from sqlalchemy.sql.elements import ColumnElement
+
+# SQL helpers that differ between Postgres (production) and SQLite (local dev).
+
+def json_number(column, key: str, dialect: str) -> ColumnElement:
+    """
+    Numeric value of `column[key]` for a JSON column, or NULL when the answer
+    is missing or not a JSON number.
+    """
+    if dialect == "postgresql":
+        return case(
+            (func.json_typeof(column.op("->")(literal(key))) == "number",
+             cast(column.op("->>")(literal(key)), Float)),
+            else_=None,
+        )
+    path = '$."' + key.replace('"', '\\"') + '"'
+    return case(
+        (func.json_type(column, path).in_(("integer", "real")), func.json_extract(column, path)),
+        else_=None,
+    )
+
+def day_bucket(column, dialect: str) -> ColumnElement:
+    """
+    UTC calendar day of a naive-UTC timestamp column. Use `as_date` on results.
+    """
+    if dialect == "postgresql":
+        return cast(column, Date)
+    return func.date(column)
+
+def as_date(value) -> date:
+    # SQLite returns 'YYYY-MM-DD' strings
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+def utc_offsets(zone: ZoneInfo, start: datetime, end: datetime) -> List[Tuple[datetime, int]]:
+    """
+    UTC offsets (seconds) of `zone` over the naive-UTC range [start, end], as
+    (valid_from, offset) pairs. The first pair's valid_from is `start`.
+    """
+    def offset(at: datetime) -> int:
+        return int(at.replace(tzinfo=timezone.utc).astimezone(zone).utcoffset().total_seconds())
+
+    spans = [(start, offset(start))]
+    day = start
+    while day < end:
+        step = min(day + timedelta(days=1), end)
+        if offset(step) != spans[-1][1]:
+            # Narrow the change down to the second
+            lo, hi = day, step
+            while hi - lo > timedelta(seconds=1):
+                mid = lo + (hi - lo) / 2
+                if offset(mid) == spans[-1][1]:
+                    lo = mid
+                else:
+                    hi = mid
+            spans.append((hi.replace(microsecond=0), offset(step)))
+        day = step
+    return spans
+
+def time_bucket(column, bucket: str, tz: str, dialect: str, start: datetime, end: datetime) -> ColumnElement:
+    """
+    Start of the 'hour', 'day' or 'week' (Monday) containing a naive-UTC
+    timestamp column, as naive wall-clock time in `tz`. Use `as_datetime` on
+    results. SQLite has no time zone data, so the offsets in effect between
+    `start` and `end` are inlined.
+    """
+    if dialect == "postgresql":
+        return func.date_trunc(bucket, func.timezone(tz, func.timezone("UTC", column)))
+
+    spans = utc_offsets(ZoneInfo(tz), start, end)
+    shifted = [func.datetime(column, f"{seconds:+d} seconds") for _, seconds in spans]
+    local = shifted[0]
+    if len(spans) > 1:
+        local = case(
+            *[(column < valid_from, value) for (valid_from, _), value in zip(spans[1:], shifted)],
+            else_=shifted[-1],
+        )
+    if bucket == "hour":
+        return func.strftime("%Y-%m-%d %H:00:00", local)
+    if bucket == "week":
+        return func.strftime("%Y-%m-%d 00:00:00", local, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-%d 00:00:00", local)
+
+def as_datetime(value) -> datetime:
+    # SQLite returns 'YYYY-MM-DD HH:MM:SS' strings
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
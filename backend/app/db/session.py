@@ -1,5 +1,7 @@
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
 
 engine = create_engine(
@@ -11,3 +13,23 @@ engine = create_engine(
 def get_session():
     with Session(engine) as session:
         yield session
+
+# Async engine for the high-traffic public paths (asyncpg / aiosqlite)
+def _async_database_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    echo=False,
+    pool_pre_ping=True,
+)
+
+async_session_maker = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+async def get_async_session():
+    async with async_session_maker() as session:
+        yield session
@@ -1,13 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
 import os
+import secrets
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.limiter import limiter
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
 from app.db import base # Import models for side-effects
 from app.core.monitoring import MonitoringMiddleware
+from app.core.metrics import metrics
 
 from fastapi.staticfiles import StaticFiles
+from app.core.static_files import PrecompressedStaticFiles
+from app.core.config import settings
 
 app = FastAPI(
     title="QR Feedback SaaS API",
@@ -22,8 +25,9 @@ app = FastAPI(
 os.makedirs("uploads", exist_ok=True)
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Pre-rendered public form snapshots (gzip-aware, cache headers per file)
+os.makedirs(settings.SNAPSHOT_DIR, exist_ok=True)
+app.mount("/snapshots", PrecompressedStaticFiles(directory=settings.SNAPSHOT_DIR), name="snapshots")
 
 # CORS Configuration
 # CORS Configuration
@@ -54,6 +58,12 @@ app.add_middleware(MonitoringMiddleware)
 
 from datetime import datetime
 from app.initial_data import init as init_db
+from app.services.ingest_service import feedback_ingest
+from app.services.sentiment_worker import sentiment_worker
+from app.services.notification_service import alert_dispatcher
+from app.services.qr_service import qr_service
+from app.services.rollup_service import rollup_service
+from app.services.export_worker import export_worker
 
 @app.on_event("startup")
 async def startup_event():
@@ -62,6 +72,24 @@ async def startup_event():
         init_db()
     except Exception as e:
         print(f"Error initializing database: {e}")
+    if settings.SENTIMENT_WORKER_IN_PROCESS:
+        sentiment_worker.start()
+    if settings.ROLLUP_WORKER_IN_PROCESS:
+        rollup_service.start()
+    if settings.EXPORT_WORKER_IN_PROCESS:
+        export_worker.start()
+    metrics.start()
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # Drain queued feedback batches before the worker exits
+    feedback_ingest.shutdown()
+    sentiment_worker.shutdown()
+    rollup_service.shutdown()
+    export_worker.shutdown()
+    alert_dispatcher.shutdown()
+    qr_service.shutdown()
+    metrics.shutdown()
 
 @app.get("/")
 def read_root():
@@ -71,6 +99,19 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def prometheus_metrics(authorization: Optional[str] = Header(None)):
+    """
+    Request metrics of all workers, Prometheus text format. Per-tenant
+    traffic and the route inventory are not public: served only with the
+    METRICS_AUTH_TOKEN bearer token, and not at all while it is unset.
+    """
+    if not settings.METRICS_AUTH_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(authorization or "", f"Bearer {settings.METRICS_AUTH_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Not authorized")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 from app.api.api_v1.api import api_router
 from app.core.config import settings
 
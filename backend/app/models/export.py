@@ -0,0 +1,54 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+from sqlalchemy import Index, text
+
+ACTIVE_STATUSES = ("pending", "running")
+
+class ExportJobBase(SQLModel):
+    form_id: int = Field(foreign_key="form.id")
+    format: str = Field(default="csv", regex="^(csv|ndjson|parquet|xlsx)$")
+    gzip: bool = Field(default=False)
+    location_id: Optional[int] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
+class ExportJob(ExportJobBase, table=True):
+    __table_args__ = (
+        # At most one pending/running job per identical request
+        Index(
+            "uq_exportjob_active_dedupe_key", "dedupe_key", unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+            sqlite_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    tenant_id: int = Field(foreign_key="tenant.id", index=True)
+    requested_by_id: Optional[int] = Field(default=None, foreign_key="users.id", nullable=True)
+    dedupe_key: str = Field(max_length=64) # Hash of form, filters, format and schema version
+    status: str = Field(default="pending", index=True) # pending, running, complete, failed, expired
+    rows_total: Optional[int] = None
+    rows_done: int = Field(default=0)
+    size_bytes: Optional[int] = None
+    file_path: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow) # Worker heartbeat while running
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+class ExportJobCreate(ExportJobBase):
+    pass
+
+class ExportJobRead(ExportJobBase):
+    id: int
+    status: str
+    rows_total: Optional[int] = None
+    rows_done: int
+    progress: Optional[float] = None # 0..1 once the row count is known
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
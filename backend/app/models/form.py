@@ -2,6 +2,7 @@ from typing import Optional, List, Dict, Any
 from sqlmodel import SQLModel, Field, Relationship
 from sqlmodel import JSON
 from datetime import datetime
+from sqlalchemy import Index, UniqueConstraint
 
 class FormBase(SQLModel):
     title: str
@@ -38,6 +39,23 @@ class FormRead(FormBase):
     created_at: datetime
     tenant_id: int
 
+# Public (QR scan) payload: form plus tenant branding
+class TenantBranding(SQLModel):
+    name: str
+    tagline: Optional[str] = None
+    logo_url: Optional[str] = None
+    logo_position: str = "top-left"
+    primary_color: Optional[str] = "#4F46E5"
+    secondary_color: Optional[str] = "#374151"
+    accent_color: Optional[str] = "#F3F4F6"
+    font_family: Optional[str] = "Inter"
+    address: Optional[str] = None
+    is_branding_approved: bool = False
+
+class PublicFormRead(FormBase):
+    id: int
+    tenant: TenantBranding
+
 
 # The Feedback Response Table
 class ValuesBase(SQLModel):
@@ -46,19 +64,66 @@ class ValuesBase(SQLModel):
     location_id: Optional[int] = Field(default=None, foreign_key="location.id", nullable=True)
 
 class Values(ValuesBase, table=True):
+    __table_args__ = (
+        UniqueConstraint("form_id", "idempotency_key", name="uq_values_form_idempotency_key"),
+        Index("ix_values_form_created_id", "form_id", "created_at", "id"),
+        Index("ix_values_form_updated_id", "form_id", "updated_at", "id"),
+        Index("ix_values_updated_at", "updated_at"), # Rollup watermark
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Bumped by every insert/UPDATE (sentiment backfill, normalization); drives the changes feed
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
+    idempotency_key: Optional[str] = Field(default=None, max_length=64) # Client-generated, for safe retries
     
     # AI Fields
     sentiment: Optional[str] = None
     ai_analysis: Optional[str] = None
+    analysis_status: str = Field(default="pending", index=True) # pending -> processing -> complete; rescore -> rescoring -> complete
     
     # Relationships
     form: "Form" = Relationship(back_populates="responses")
 
 class ValuesCreate(ValuesBase):
-    pass
+    # Client-generated submission UUID; the Idempotency-Key header takes precedence
+    idempotency_key: Optional[str] = Field(default=None, max_length=64)
 
 class ValuesRead(ValuesBase):
     id: int
     created_at: datetime
+
+class FeedbackResponseRead(ValuesRead):
+    sentiment: Optional[str] = None
+    analysis_status: str
+
+class FeedbackResponsePage(SQLModel):
+    items: List[FeedbackResponseRead]
+    next_cursor: Optional[str] = None # Pass as ?cursor= for the next (older) page
+
+# Offline / kiosk replay
+class ValuesBatchItem(ValuesCreate):
+    client_created_at: Optional[datetime] = None # When the response was captured on the device
+
+class ValuesBatchResult(SQLModel):
+    index: int
+    status: str # created, duplicate, rejected
+    id: Optional[int] = None
+    sentiment: Optional[str] = None
+    detail: Optional[str] = None
+
+# Analytics
+class TimeseriesPoint(SQLModel):
+    t: datetime # Bucket start, local to the requested time zone
+    count: int # Responses (rated answers for avg)
+    value: Optional[float] = None
+    sentiment: Optional[Dict[str, int]] = None
+
+class FeedbackTimeseries(SQLModel):
+    bucket: str
+    metric: str
+    field_id: Optional[str] = None
+    tz: str
+    start: datetime
+    end: datetime
+    points: List[TimeseriesPoint]
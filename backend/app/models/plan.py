@@ -12,6 +12,7 @@ class SubscriptionPlanBase(SQLModel):
     max_responses_per_month: int
     max_locations: int = Field(default=1)
     max_team_members: int = Field(default=1)
+    rate_limit_per_minute: int = Field(default=30) # Public requests per form per client IP
     
     # Status
     is_active: bool = Field(default=True)
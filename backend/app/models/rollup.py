@@ -0,0 +1,28 @@
+from typing import Optional, Dict
+from sqlmodel import SQLModel, Field
+from sqlmodel import JSON
+from datetime import datetime, date
+
+class FeedbackRollupBase(SQLModel):
+    form_id: int = Field(foreign_key="form.id", primary_key=True)
+    location_id: int = Field(default=0, primary_key=True) # 0 = no location
+    day: date = Field(primary_key=True, index=True) # UTC day
+    field_id: str = Field(default="", primary_key=True) # "" = whole-response totals
+
+    count: int = Field(default=0) # Responses ("" row) or numeric answers (field rows)
+    sum: float = Field(default=0) # Sum of numeric answers
+    histogram: Dict[str, int] = Field(default={}, sa_type=JSON) # score -> answers
+
+    # Sentiment counts ("" row only)
+    positive: int = Field(default=0)
+    negative: int = Field(default=0)
+    neutral: int = Field(default=0)
+
+class FeedbackRollup(FeedbackRollupBase, table=True):
+    pass
+
+class RollupWatermark(SQLModel, table=True):
+    name: str = Field(primary_key=True)
+    last_updated_at: Optional[datetime] = None # Values.updated_at rolled up through
+    frontier: Optional[datetime] = None # Days before this are complete in the rollup
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
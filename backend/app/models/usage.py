@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+class TenantUsageCounterBase(SQLModel):
+    tenant_id: int = Field(foreign_key="tenant.id", primary_key=True)
+    period: str = Field(primary_key=True) # e.g., "2026-01" (UTC year-month)
+    responses_count: int = Field(default=0)
+
+class TenantUsageCounter(TenantUsageCounterBase, table=True):
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class TenantUsageCounterRead(TenantUsageCounterBase):
+    updated_at: datetime
@@ -0,0 +1,83 @@
+import argparse
+import logging
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, select
+from app.db.session import engine
+from app.db import base  # noqa: F401
+from app.models.form import Form, Values
+from app.services.validation_service import CONVERTERS
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def normalize_form(session: Session, form: Form, batch_size: int) -> int:
+    """
+    Rewrite rating answers stored before submissions were validated
+    (e.g. "4") as ints. Values that cannot be converted are left untouched.
+    """
+    ratings = {
+        f["id"]: CONVERTERS["rating"](f)
+        for f in (form.form_schema or {}).get("fields", [])
+        if f.get("type") == "rating" and f.get("id")
+    }
+    if not ratings:
+        return 0
+
+    changed = 0
+    last_id = 0
+    while True:
+        rows = session.exec(
+            select(Values.id, Values.data)
+            .where(Values.form_id == form.id)
+            .where(Values.id > last_id)
+            .order_by(Values.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for row in rows:
+            data = dict(row.data or {})
+            for fid, convert in ratings.items():
+                value = data.get(fid)
+                if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+                    continue
+                try:
+                    data[fid] = convert(value)
+                except ValueError:
+                    continue
+            if data != row.data:
+                updates.append({"row_id": row.id, "row_data": data})
+
+        if updates:
+            session.connection().execute(
+                update(Values.__table__)
+                .where(Values.__table__.c.id == bindparam("row_id"))
+                .values(data=bindparam("row_data")),
+                updates,
+            )
+            session.commit()
+            changed += len(updates)
+    return changed
+
+def normalize(form_id: int = None, batch_size: int = 1000):
+    with Session(engine) as session:
+        query = select(Form)
+        if form_id:
+            query = query.where(Form.id == form_id)
+        for form in session.exec(query).all():
+            changed = normalize_form(session, form, batch_size)
+            if changed:
+                logger.info(f"Normalized {changed} response(s) for form {form.id}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert legacy rating answers to typed values")
+    parser.add_argument("--form-id", type=int, help="Only normalize this form")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    normalize(args.form_id, args.batch_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import argparse
+import logging
+from datetime import datetime
+from sqlmodel import Session
+from app.db.session import engine
+from app.db import base  # noqa: F401
+from app.services.usage_service import usage_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def reconcile(month: str = None, tenant_id: int = None):
+    now = datetime.strptime(month, "%Y-%m") if month else None
+    with Session(engine) as session:
+        counts = usage_service.rebuild_counters(session, now=now, tenant_id=tenant_id)
+    logger.info(f"Rebuilt usage counters for {len(counts)} tenant(s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild monthly response counters from Values")
+    parser.add_argument("--month", help="Month to rebuild as YYYY-MM (default: current month)")
+    parser.add_argument("--tenant-id", type=int, help="Only rebuild this tenant")
+    args = parser.parse_args()
+    reconcile(args.month, args.tenant_id)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import argparse
+import logging
+from app.db import base  # noqa: F401
+from app.services.rollup_service import rollup_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the daily feedback rollup")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the rollup and rebuild it from all responses")
+    parser.add_argument("--once", action="store_true", help="Roll up new responses once and exit")
+    args = parser.parse_args()
+    if args.rebuild:
+        written = rollup_service.rebuild()
+        logger.info(f"Rebuilt rollup: {written} bucket(s)")
+    elif args.once:
+        written = rollup_service.run_once()
+        logger.info(f"Rolled up {written} bucket(s)")
+    else:
+        logger.info("Rolling up new responses every %ss", rollup_service.interval_seconds)
+        rollup_service.run_forever()
+
+if __name__ == "__main__":
+    main()
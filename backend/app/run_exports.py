@@ -0,0 +1,31 @@
+import argparse
+import logging
+from app.db.session import engine
+from app.db import base  # noqa: F401
+from app.services.export_worker import export_worker
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build queued export files in a dedicated worker")
+    parser.add_argument("--once", action="store_true", help="Drain the queue, expire old files and exit")
+    args = parser.parse_args()
+
+    engine.echo = False
+    if args.once:
+        built = 0
+        while export_worker.run_once():
+            built += 1
+        expired = export_worker.expire()
+        logger.info(f"Built {built} export(s), expired {expired}")
+        return
+
+    logger.info("Export worker started")
+    try:
+        export_worker.run_forever()
+    except KeyboardInterrupt:
+        export_worker.shutdown()
+
+if __name__ == "__main__":
+    main()
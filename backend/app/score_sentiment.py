@@ -0,0 +1,56 @@
+import argparse
+import logging
+from sqlmodel import Session, update
+from app.db.session import engine
+from app.db import base  # noqa: F401
+from app.models.form import Values
+from app.services.sentiment_worker import SentimentWorker
+from app.services.notification_service import alert_dispatcher
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="Score pending feedback sentiment in a dedicated worker")
+    parser.add_argument("--processes", type=int, default=settings.SENTIMENT_WORKER_PROCESSES)
+    parser.add_argument("--batch-size", type=int, default=settings.SENTIMENT_WORKER_BATCH_SIZE)
+    parser.add_argument("--rescore-all", action="store_true", help="Queue every scored response for rescoring first (e.g. after a lexicon change)")
+    parser.add_argument("--once", action="store_true", help="Drain the pending queue and exit")
+    args = parser.parse_args()
+
+    engine.echo = False
+    if args.rescore_all:
+        with Session(engine) as session:
+            # "rescore" rows are scored by every worker (including the API's)
+            # but never alert on historical feedback
+            session.exec(update(Values).where(Values.analysis_status == "complete").values(analysis_status="rescore"))
+            session.commit()
+        logger.info("Queued all responses for rescoring")
+
+    worker = SentimentWorker(
+        processes=args.processes,
+        batch_size=args.batch_size,
+        poll_seconds=settings.SENTIMENT_WORKER_POLL_SECONDS,
+    )
+    if args.once:
+        total = 0
+        while True:
+            scored = worker.run_once()
+            total += scored
+            if scored < args.batch_size:
+                break
+        logger.info(f"Scored {total} responses")
+        worker.shutdown()
+        alert_dispatcher.shutdown()
+        return
+
+    logger.info("Sentiment worker started")
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.shutdown()
+        alert_dispatcher.shutdown()
+
+if __name__ == "__main__":
+    main()
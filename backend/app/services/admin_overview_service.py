@@ -0,0 +1,98 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from sqlalchemy import case
+from sqlmodel import Session, select, func
+from app.core.config import settings
+from app.models.form import Values
+from app.models.plan import SubscriptionPlan
+from app.models.tenant import Tenant
+
+class AdminOverviewService:
+    """
+    Platform-wide counts for the super admin dashboard.
+
+    Computed in two aggregate queries (tenant and feedback counts in one
+    pass, tenants per plan in a GROUP BY) and cached for
+    ADMIN_OVERVIEW_TTL_SECONDS. On a miss only one request recomputes; the
+    others wait for it and share the result. Tenant creation, suspension and
+    plan changes invalidate the cache (in this worker; the TTL bounds
+    staleness elsewhere).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._value: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._compute_lock = threading.Lock()
+
+    def _fresh(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._value is not None and self._expires_at > time.monotonic():
+                return self._value
+            return None
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        value = self._fresh()
+        if value is not None:
+            return value
+        with self._compute_lock:
+            # Someone else may have recomputed while we waited
+            value = self._fresh()
+            if value is not None:
+                return value
+            with self._lock:
+                generation = self._generation
+            value = self.compute(db)
+            with self._lock:
+                # Don't cache a result an invalidation has already superseded
+                if generation == self._generation:
+                    self._value = value
+                    self._expires_at = time.monotonic() + self.ttl_seconds
+            return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._value = None
+
+    def compute(self, db: Session) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        seven_days_ago = now - timedelta(days=7)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        total, active, new_7d, feedback_total, feedback_today = db.exec(
+            select(
+                func.count(Tenant.id),
+                func.sum(case((Tenant.is_active == True, 1), else_=0)),
+                func.sum(case((Tenant.created_at >= seven_days_ago, 1), else_=0)),
+                select(func.count(Values.id)).scalar_subquery(),
+                select(func.count(Values.id)).where(Values.created_at >= today_start).scalar_subquery(),
+            )
+        ).one()
+
+        plans = db.exec(
+            select(SubscriptionPlan.name, func.count(Tenant.id))
+            .select_from(SubscriptionPlan)
+            .outerjoin(Tenant, Tenant.plan_id == SubscriptionPlan.id)
+            .group_by(SubscriptionPlan.id, SubscriptionPlan.name)
+            .order_by(SubscriptionPlan.id)
+        ).all()
+
+        return {
+            "tenants": {
+                "total": total,
+                "active": active or 0,
+                "new_7d": new_7d or 0,
+            },
+            "feedback": {
+                "total": feedback_total,
+                "today": feedback_today,
+            },
+            "subscriptions": [{"name": name, "count": count} for name, count in plans],
+        }
+
+admin_overview_service = AdminOverviewService(settings.ADMIN_OVERVIEW_TTL_SECONDS)
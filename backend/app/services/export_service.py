@@ -0,0 +1,365 @@
+import csv
+import importlib.util
+import io
+import json
+import re
+import tempfile
+import zipfile
+from datetime import date, datetime
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import Row, tuple_
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.core.streams import ChunkBuffer, gzip_stream
+from app.db.session import engine
+from app.models.form import Form, Values
+from app.models.location import Location
+from app.models.tenant import Tenant
+from app.models.user import User
+
+# format -> (media type, file extension, optional dependency)
+FORMATS = {
+    "csv": ("text/csv", "csv", None),
+    "ndjson": ("application/x-ndjson", "ndjson", None),
+    "parquet": ("application/vnd.apache.parquet", "parquet", "pyarrow"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx", "openpyxl"),
+}
+# Container formats that are compressed already
+COMPRESSED_FORMATS = ("parquet", "xlsx")
+
+XLSX_MAX_ROWS = 1048576 # Per sheet, header included
+
+def _csv_text(header: List[str], rows: Sequence[Sequence[Any]]) -> str:
+    output = io.StringIO()
+    output.write('\ufeff') # BOM for Excel compatibility
+    writer = csv.writer(output)
+    writer.writerow(header)
+    writer.writerows(
+        ["" if v is None else v.isoformat() if isinstance(v, datetime) else str(v) for v in row] for row in rows
+    )
+    return output.getvalue()
+
+class ExportFormatError(Exception):
+    pass
+
+def typed_value(value: Any, field_type: Optional[str]) -> Any:
+    """
+    Answer coerced to the type its field declares; None if it doesn't fit.
+    """
+    if value is None or value == "":
+        return None
+    try:
+        if field_type == "rating":
+            number = float(value)
+            return int(number) if number.is_integer() else None
+        if field_type == "boolean":
+            return value if isinstance(value, bool) else None
+        if field_type == "date":
+            return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+        if field_type == "checkbox":
+            return [str(v) for v in value] if isinstance(value, list) else [str(value)]
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+class ExportService:
+    """
+    Response exports that run in constant memory.
+
+    Rows are read as plain (id, created_at, location_id, data) tuples through
+    a server-side cursor (`stream_results`; psycopg2 named cursor on Postgres,
+    keyset pages on SQLite) in chunks of EXPORT_CHUNK_ROWS, and each chunk is formatted and handed
+    out as one piece (one row group for Parquet). The exports open their own
+    session because they are consumed after the request handler has returned.
+    """
+
+    def __init__(self, chunk_rows: int):
+        self.chunk_rows = chunk_rows
+
+    @staticmethod
+    def columns(form: Form) -> List[Tuple[str, str, Optional[str]]]:
+        """
+        (field id, label, type) of every answerable field in the form schema,
+        in order. Fields without an id and section headers are skipped, as in
+        validation.
+        """
+        return [
+            (f["id"], f.get("label") or f["id"], f.get("type"))
+            for f in (form.form_schema or {}).get("fields", [])
+            if f.get("id") and f.get("type") != "section"
+        ]
+
+    def check_format(self, format: str, gzip: bool = False) -> None:
+        if format not in FORMATS:
+            raise ExportFormatError(f"Unknown export format: {format}")
+        dependency = FORMATS[format][2]
+        if dependency and importlib.util.find_spec(dependency) is None:
+            raise ExportFormatError(f"{format} export is not available: install {dependency}")
+        if gzip and format in COMPRESSED_FORMATS:
+            raise ExportFormatError(f"{format} files are already compressed; drop gzip")
+
+    def filename(self, form: Form, format: str, gzip: bool = False) -> str:
+        name = f"export_{form.slug}_{datetime.now().strftime('%Y%m%d')}.{FORMATS[format][1]}"
+        return name + ".gz" if gzip else name
+
+    def media_type(self, format: str, gzip: bool = False) -> str:
+        return "application/gzip" if gzip else FORMATS[format][0]
+
+    @staticmethod
+    def filters(
+        form_id: int,
+        location_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> list:
+        filters = [Values.form_id == form_id]
+        if location_id:
+            filters.append(Values.location_id == location_id)
+        if start_date:
+            filters.append(Values.created_at >= start_date)
+        if end_date:
+            filters.append(Values.created_at <= end_date)
+        return filters
+
+    def iter_rows(self, filters: list) -> Iterator[Sequence[Row]]:
+        """
+        Chunks of (id, created_at, location_id, data) rows, oldest first.
+        """
+        query = (
+            select(Values.id, Values.created_at, Values.location_id, Values.data)
+            .where(*filters)
+            .order_by(Values.created_at, Values.id)
+        )
+        if engine.dialect.name == "sqlite":
+            # No server-side cursors, and an open read would block writers
+            # (submissions, job progress) for the whole export: page by keyset
+            last = None
+            while True:
+                page = query.limit(self.chunk_rows)
+                if last:
+                    page = page.where(tuple_(Values.created_at, Values.id) > last)
+                with Session(engine) as db:
+                    chunk = db.execute(page).all()
+                if not chunk:
+                    return
+                yield chunk
+                last = (chunk[-1][1], chunk[-1][0])
+
+        with Session(engine) as db:
+            result = db.execute(query.execution_options(stream_results=True, yield_per=self.chunk_rows))
+            for chunk in result.partitions():
+                yield chunk
+
+    def iter_export(
+        self,
+        form: Form,
+        format: str = "csv",
+        location_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        gzip: bool = False,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[Any]:
+        """
+        Stream an export; call `check_format` first. `progress` is called
+        with the row count of every chunk read.
+        """
+        writer = {
+            "csv": self.iter_csv,
+            "ndjson": self.iter_ndjson,
+            "parquet": self.iter_parquet,
+            "xlsx": self.iter_xlsx,
+        }[format]
+        rows = self.iter_rows(self.filters(form.id, location_id, start_date, end_date))
+        if progress:
+            rows = self._report(rows, progress)
+        stream = writer(form, rows)
+        return gzip_stream(stream) if gzip else stream
+
+    @staticmethod
+    def _report(rows: Iterator[Sequence[Row]], progress: Callable[[int], None]) -> Iterator[Sequence[Row]]:
+        for chunk in rows:
+            progress(len(chunk))
+            yield chunk
+
+    def iter_csv(self, form: Form, rows: Iterator[Sequence[Row]]) -> Iterator[str]:
+        columns = self.columns(form)
+        field_order = [fid for fid, _, _ in columns]
+
+        output = io.StringIO()
+        writer = csv.writer(output)
+        output.write('\ufeff') # BOM for Excel compatibility
+        writer.writerow(["ID", "Created At", "Location ID"] + [label for _, label, _ in columns])
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+
+        for chunk in rows:
+            writer.writerows(
+                [str(id), created_at.isoformat(), str(loc or "")] + [str((data or {}).get(fid, "")) for fid in field_order]
+                for id, created_at, loc, data in chunk
+            )
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+
+    def iter_ndjson(self, form: Form, rows: Iterator[Sequence[Row]]) -> Iterator[str]:
+        """
+        One JSON object per response; answers keep their JSON types.
+        """
+        for chunk in rows:
+            yield "".join(
+                json.dumps(
+                    {"id": id, "created_at": created_at.isoformat(), "location_id": loc, "data": data or {}},
+                    separators=(",", ":"), default=str,
+                ) + "\n"
+                for id, created_at, loc, data in chunk
+            )
+
+    def iter_parquet(self, form: Form, rows: Iterator[Sequence[Row]]) -> Iterator[bytes]:
+        """
+        Parquet typed from the form schema (ratings int64, dates date32,
+        checkboxes list<string>), one row group per chunk. Columns are named
+        by field ID; labels are kept in the field metadata.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {"rating": pa.int64(), "boolean": pa.bool_(), "date": pa.date32(), "checkbox": pa.list_(pa.string())}
+        columns = self.columns(form)
+        schema = pa.schema(
+            [pa.field("id", pa.int64(), nullable=False),
+             pa.field("created_at", pa.timestamp("us")),
+             pa.field("location_id", pa.int64())]
+            + [pa.field(fid, types.get(ftype, pa.string()), metadata={"label": label})
+               for fid, label, ftype in columns]
+        )
+
+        sink = ChunkBuffer()
+        with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+            for chunk in rows:
+                arrays = [
+                    pa.array([r[0] for r in chunk], pa.int64()),
+                    pa.array([r[1] for r in chunk], pa.timestamp("us")),
+                    pa.array([r[2] for r in chunk], pa.int64()),
+                ]
+                for fid, _, ftype in columns:
+                    arrays.append(pa.array(
+                        [typed_value((r[3] or {}).get(fid), ftype) for r in chunk], types.get(ftype, pa.string())
+                    ))
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=len(chunk))
+                yield sink.drain()
+        yield sink.drain()
+
+    def iter_xlsx(self, form: Form, rows: Iterator[Sequence[Row]]) -> Iterator[bytes]:
+        """
+        XLSX is a ZIP whose directory comes last, so the workbook is written
+        (write-only mode, rows spooled to disk) to a temporary file first and
+        then streamed. Rolls over to a new sheet at the Excel row limit.
+        """
+        from openpyxl import Workbook
+
+        columns = self.columns(form)
+        header = ["ID", "Created At", "Location ID"] + [label for _, label, _ in columns]
+        workbook = Workbook(write_only=True)
+        sheet, rows_in_sheet = None, XLSX_MAX_ROWS
+
+        for chunk in rows:
+            for id, created_at, loc, data in chunk:
+                if rows_in_sheet >= XLSX_MAX_ROWS:
+                    sheet = workbook.create_sheet(f"Responses {len(workbook.worksheets) + 1}" if sheet else "Responses")
+                    sheet.append(header)
+                    rows_in_sheet = 1
+                row = [id, created_at, loc]
+                for fid, _, ftype in columns:
+                    value = typed_value((data or {}).get(fid), ftype)
+                    row.append(", ".join(value) if isinstance(value, list) else value)
+                sheet.append(row)
+                rows_in_sheet += 1
+        if sheet is None:
+            workbook.create_sheet("Responses").append(header)
+
+        with tempfile.TemporaryFile() as f:
+            workbook.save(f)
+            f.seek(0)
+            while True:
+                data = f.read(1024 * 1024)
+                if not data:
+                    break
+                yield data
+
+    def tenant_filename(self, tenant: Tenant, dump: bool = False) -> str:
+        return f"{'dump' if dump else 'export'}_{tenant.slug}_{datetime.now().strftime('%Y%m%d')}.zip"
+
+    def iter_tenant_zip(self, tenant_id: int, include_users: bool = False) -> Iterator[bytes]:
+        """
+        All of a tenant's data as one ZIP built on the fly: a CSV of
+        responses per form (read through `iter_rows`, one form at a time),
+        locations.csv and manifest.json (tenant, files, row counts and each
+        form's schema). Entries are stored, like the QR code ZIP, so every
+        chunk goes out as soon as it is written. `include_users` adds the
+        user accounts (without credentials) for offboarding dumps.
+        """
+        with Session(engine) as db:
+            tenant = db.get(Tenant, tenant_id)
+            forms = db.exec(select(Form).where(Form.tenant_id == tenant_id).order_by(Form.id)).all()
+            locations = db.exec(
+                select(Location.id, Location.name, Location.slug, Location.address, Location.default_form_id, Location.created_at)
+                .where(Location.tenant_id == tenant_id)
+                .order_by(Location.id)
+            ).all()
+            users = db.exec(
+                select(User.id, User.email, User.full_name, User.designation, User.role, User.is_active, User.created_at)
+                .where(User.tenant_id == tenant_id)
+                .order_by(User.id)
+            ).all() if include_users else []
+
+        manifest = {
+            "tenant": {"id": tenant.id, "name": tenant.name, "slug": tenant.slug},
+            "exported_at": datetime.utcnow().isoformat(),
+            "locations": {"file": "locations.csv", "rows": len(locations)},
+            "forms": [],
+        }
+        sink = ChunkBuffer()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+            archive.writestr("locations.csv", _csv_text(
+                ["ID", "Name", "Slug", "Address", "Default Form ID", "Created At"], locations
+            ))
+            yield sink.drain()
+
+            if include_users:
+                archive.writestr("users.csv", _csv_text(
+                    ["ID", "Email", "Full Name", "Designation", "Role", "Active", "Created At"],
+                    [(u.id, u.email, u.full_name, u.designation, getattr(u.role, "value", u.role), u.is_active, u.created_at) for u in users]
+                ))
+                manifest["users"] = {"file": "users.csv", "rows": len(users)}
+                yield sink.drain()
+
+            for form in forms:
+                entry = {
+                    "id": form.id,
+                    "title": form.title,
+                    "slug": form.slug,
+                    "file": f"forms/{form.id}_{re.sub(r'[^A-Za-z0-9_-]+', '_', form.slug)}.csv",
+                    "rows": 0,
+                    "columns": [{"id": fid, "label": label, "type": ftype} for fid, label, ftype in self.columns(form)],
+                    "form_schema": form.form_schema,
+                }
+                rows = self._report(
+                    self.iter_rows(self.filters(form.id)),
+                    lambda n, entry=entry: entry.update(rows=entry["rows"] + n),
+                )
+                # Size unknown up front: zip64 so large forms don't overflow
+                with archive.open(entry["file"], "w", force_zip64=True) as f:
+                    for text in self.iter_csv(form, rows):
+                        f.write(text.encode("utf-8"))
+                        yield sink.drain()
+                manifest["forms"].append(entry)
+                yield sink.drain()
+
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+        yield sink.drain()
+
+export_service = ExportService(settings.EXPORT_CHUNK_ROWS)
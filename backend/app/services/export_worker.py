@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, func
+from app.core.config import settings
+from app.db.session import engine
+from app.models.export import ACTIVE_STATUSES, ExportJob, ExportJobCreate
+from app.models.form import Form, Values
+from app.services.export_service import FORMATS, export_service
+from app.services.validation_service import ValidationService
+
+logger = logging.getLogger(__name__)
+
+class ExportWorker:
+    """
+    Builds export files in the background.
+
+    The DB is the queue: jobs are claimed with a compare-and-set on
+    (status, updated_at), so several workers can share the table and a job
+    whose worker died (no heartbeat for EXPORT_JOB_STALE_SECONDS) is picked
+    up again. Files are written to EXPORT_DIR under a temporary name and
+    renamed when complete; they are deleted after EXPORT_RETENTION_HOURS.
+    """
+
+    def __init__(self, directory: str, poll_seconds: float, stale_seconds: float, retention_hours: float):
+        self.directory = directory
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self.retention_hours = retention_hours
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def dedupe_key(form: Form, job: ExportJobCreate) -> str:
+        fields = (form.form_schema or {}).get("fields", [])
+        request = [
+            form.id, job.format, job.gzip, job.location_id,
+            job.start_date.isoformat() if job.start_date else None,
+            job.end_date.isoformat() if job.end_date else None,
+            ValidationService.schema_hash(fields),
+        ]
+        return hashlib.sha256(json.dumps(request).encode()).hexdigest()
+
+    def submit(self, db: Session, form: Form, job_in: ExportJobCreate, user_id: Optional[int]) -> ExportJob:
+        """
+        Queue an export, or return the pending/running job for the same request.
+        """
+        key = self.dedupe_key(form, job_in)
+        query = select(ExportJob).where(ExportJob.dedupe_key == key).where(ExportJob.status.in_(ACTIVE_STATUSES))
+        existing = db.exec(query).first()
+        if existing:
+            return existing
+
+        job = ExportJob(**job_in.dict(), tenant_id=form.tenant_id, requested_by_id=user_id, dedupe_key=key)
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Same request queued concurrently
+            db.rollback()
+            return db.exec(query).one()
+        db.refresh(job)
+        return job
+
+    def _claim(self) -> Optional[int]:
+        now = datetime.utcnow()
+        with Session(engine) as db:
+            candidate = db.exec(
+                select(ExportJob.id, ExportJob.status, ExportJob.updated_at)
+                .where(or_(
+                    ExportJob.status == "pending",
+                    and_(ExportJob.status == "running",
+                         ExportJob.updated_at < now - timedelta(seconds=self.stale_seconds)),
+                ))
+                .order_by(ExportJob.id)
+                .limit(1)
+            ).first()
+            if not candidate:
+                return None
+            job_id, status, updated_at = candidate
+            result = db.exec(
+                update(ExportJob)
+                .where(ExportJob.id == job_id)
+                .where(ExportJob.status == status)
+                .where(ExportJob.updated_at == updated_at)
+                .values(status="running", rows_done=0, updated_at=now)
+            )
+            db.commit()
+            return job_id if result.rowcount == 1 else None
+
+    def _update(self, job_id: int, **values) -> None:
+        with Session(engine) as db:
+            db.exec(update(ExportJob).where(ExportJob.id == job_id).values(updated_at=datetime.utcnow(), **values))
+            db.commit()
+
+    def build(self, job_id: int) -> None:
+        with Session(engine) as db:
+            job = db.get(ExportJob, job_id)
+            form = db.get(Form, job.form_id)
+            db.expunge_all()
+            rows_total = db.exec(
+                select(func.count(Values.id))
+                .where(*export_service.filters(job.form_id, job.location_id, job.start_date, job.end_date))
+            ).one()
+        self._update(job_id, rows_total=rows_total)
+
+        os.makedirs(self.directory, exist_ok=True)
+        extension = FORMATS[job.format][1] + (".gz" if job.gzip else "")
+        path = os.path.join(self.directory, f"{job_id}.{extension}")
+        partial = path + ".part"
+        done = 0
+
+        def progress(rows: int) -> None:
+            nonlocal done
+            done += rows
+            self._update(job_id, rows_done=done) # Doubles as the heartbeat
+
+        try:
+            with open(partial, "wb") as f:
+                for chunk in export_service.iter_export(
+                    form, job.format, job.location_id, job.start_date, job.end_date,
+                    gzip=job.gzip, progress=progress,
+                ):
+                    f.write(chunk.encode() if isinstance(chunk, str) else chunk)
+            os.replace(partial, path)
+        except Exception as e:
+            logger.error(f"Export job {job_id} failed: {e}", exc_info=True)
+            if os.path.exists(partial):
+                os.remove(partial)
+            self._update(job_id, status="failed", error=str(e)[:500], finished_at=datetime.utcnow())
+            return
+
+        now = datetime.utcnow()
+        self._update(
+            job_id, status="complete", rows_done=done, size_bytes=os.path.getsize(path), file_path=path,
+            finished_at=now, expires_at=now + timedelta(hours=self.retention_hours),
+        )
+
+    def expire(self) -> int:
+        """
+        Delete files of jobs past their retention. Returns the number expired.
+        """
+        with Session(engine) as db:
+            jobs = db.exec(
+                select(ExportJob).where(ExportJob.status == "complete").where(ExportJob.expires_at < datetime.utcnow())
+            ).all()
+            for job in jobs:
+                if job.file_path and os.path.exists(job.file_path):
+                    os.remove(job.file_path)
+                job.status = "expired"
+                job.file_path = None
+                db.add(job)
+            db.commit()
+            return len(jobs)
+
+    def run_once(self) -> bool:
+        """
+        Build one queued export. Returns False when there was nothing to do.
+        """
+        job_id = self._claim()
+        if job_id is None:
+            return False
+        self.build(job_id)
+        return True
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.expire()
+                while not self._stop.is_set() and self.run_once():
+                    pass
+            except Exception as e:
+                logger.error(f"Export worker failed: {e}", exc_info=True)
+            self._stop.wait(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="export-worker", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds + 5)
+
+export_worker = ExportWorker(
+    directory=settings.EXPORT_DIR,
+    poll_seconds=settings.EXPORT_WORKER_POLL_SECONDS,
+    stale_seconds=settings.EXPORT_JOB_STALE_SECONDS,
+    retention_hours=settings.EXPORT_RETENTION_HOURS,
+)
@@ -0,0 +1,201 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+from app.core.config import settings
+from app.db.session import engine
+from app.models.form import Values
+from app.services.usage_service import usage_service
+
+logger = logging.getLogger(__name__)
+
+class QuotaExceededError(Exception):
+    pass
+
+class DuplicateSubmissionError(Exception):
+    pass
+
+def _is_duplicate_key(error: IntegrityError) -> bool:
+    """
+    Whether the insert failed on the (form_id, idempotency_key) constraint.
+    Postgres names the constraint; SQLite lists its columns.
+    """
+    message = str(error.orig).lower()
+    return "uq_values_form_idempotency_key" in message or "values.idempotency_key" in message
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+@dataclass
+class PendingFeedback:
+    row: Dict[str, Any]
+    tenant_id: int
+    max_responses: Optional[int]
+    future: Future = field(default_factory=Future)
+
+class FeedbackIngestService:
+    """
+    Group-commit pipeline for public feedback (opt-in via FEEDBACK_GROUP_COMMIT).
+
+    Request threads enqueue validated `Values` rows and wait on a future.
+    A single flusher thread drains the queue when FEEDBACK_BATCH_SIZE rows
+    are pending or FEEDBACK_BATCH_INTERVAL_MS has passed, writes them with
+    one multi-row INSERT and commits once. The future resolves with the
+    durable row ID only after that commit.
+    """
+
+    def __init__(self, batch_size: int, interval_ms: int):
+        self.batch_size = batch_size
+        self.interval = interval_ms / 1000.0
+        self._queue: "queue.Queue[PendingFeedback]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = False
+
+    def _ensure_started(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="feedback-ingest", daemon=True)
+            self._thread.start()
+
+    def submit(self, row: Dict[str, Any], tenant_id: int, max_responses: Optional[int] = None) -> Future:
+        """
+        Queue a row for insertion. The returned future yields the row ID, or
+        raises QuotaExceededError if the tenant ran out of quota and
+        DuplicateSubmissionError if its idempotency key is already stored.
+        """
+        self._ensure_started()
+        item = PendingFeedback(row=row, tenant_id=tenant_id, max_responses=max_responses)
+        self._queue.put(item)
+        return item.future
+
+    def _collect(self) -> List[PendingFeedback]:
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch:
+                self.flush(batch)
+            elif self._stopping:
+                return
+
+    def _reserve(self, db: Session, batch: List[PendingFeedback]) -> List[PendingFeedback]:
+        """
+        Charge monthly quota per tenant. Rows past the limit are rejected.
+        """
+        accepted = []
+        by_tenant: Dict[int, List[PendingFeedback]] = {}
+        for item in batch:
+            by_tenant.setdefault(item.tenant_id, []).append(item)
+
+        for tenant_id, items in by_tenant.items():
+            granted = usage_service.reserve_available(db, tenant_id, items[0].max_responses, len(items))
+            accepted.extend(items[:granted])
+            for item in items[granted:]:
+                item.future.set_exception(QuotaExceededError())
+        return accepted
+
+    def _coalesce_duplicates(self, batch: List[PendingFeedback]) -> List[PendingFeedback]:
+        """
+        Rows sharing an idempotency key within one batch are written once;
+        the repeats resolve with the first row's outcome.
+        """
+        unique: List[PendingFeedback] = []
+        first_by_key: Dict[tuple, PendingFeedback] = {}
+        for item in batch:
+            key = item.row.get("idempotency_key")
+            if not key:
+                unique.append(item)
+                continue
+            first = first_by_key.get((item.row["form_id"], key))
+            if first is None:
+                first_by_key[(item.row["form_id"], key)] = item
+                unique.append(item)
+            else:
+                first.future.add_done_callback(lambda f, dup=item: _copy_outcome(f, dup.future))
+        return unique
+
+    def _write(self, batch: List[PendingFeedback]) -> None:
+        with Session(engine) as db:
+            accepted = self._reserve(db, batch)
+            ids = []
+            if accepted:
+                result = db.execute(
+                    insert(Values).returning(Values.id, sort_by_parameter_order=True),
+                    [item.row for item in accepted],
+                )
+                ids = [row[0] for row in result]
+            db.commit()
+
+        for item, row_id in zip(accepted, ids):
+            item.future.set_result(row_id)
+
+    def flush(self, batch: List[PendingFeedback]) -> None:
+        # Claim the futures first: rows whose caller has already given up are
+        # dropped, and the rest can no longer be cancelled under us
+        batch = [item for item in batch if item.future.set_running_or_notify_cancel()]
+        batch = self._coalesce_duplicates(batch)
+        try:
+            self._write(batch)
+        except IntegrityError:
+            # A concurrent request stored one of the idempotency keys first (or
+            # a row is invalid, e.g. an unknown location): fall back to
+            # row-by-row so only the offending rows fail
+            for item in batch:
+                if item.future.done():
+                    continue
+                try:
+                    self._write([item])
+                except IntegrityError as e:
+                    if item.row.get("idempotency_key") and _is_duplicate_key(e):
+                        item.future.set_exception(DuplicateSubmissionError())
+                    else:
+                        item.future.set_exception(e)
+                except Exception as e:
+                    item.future.set_exception(e)
+        except Exception as e:
+            logger.error(f"Feedback batch of {len(batch)} failed: {e}", exc_info=True)
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+
+    def shutdown(self) -> None:
+        """
+        Stop the flusher after draining everything already queued.
+        """
+        self._stopping = True
+        if self._thread:
+            self._thread.join(timeout=settings.FEEDBACK_BATCH_TIMEOUT_SECONDS)
+
+feedback_ingest = FeedbackIngestService(
+    batch_size=settings.FEEDBACK_BATCH_SIZE,
+    interval_ms=settings.FEEDBACK_BATCH_INTERVAL_MS,
+)
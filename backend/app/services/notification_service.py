@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import smtplib
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.db.session import engine
+from app.models.form import Form
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# --- Transports ---
+
+class LogTransport:
+    """
+    Default transport when no SMTP server is configured.
+    """
+    def send(self, message: EmailMessage) -> None:
+        logger.info(f"ALERT EMAIL to {message['To']}: {message['Subject']}")
+
+class SMTPTransport:
+    def __init__(self, host: str, port: int, user: Optional[str] = None, password: Optional[str] = None, use_tls: bool = False):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+
+    def send(self, message: EmailMessage) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.user:
+                smtp.login(self.user, self.password or "")
+            smtp.send_message(message)
+
+def get_transport():
+    if settings.SMTP_HOST:
+        return SMTPTransport(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            settings.SMTP_USER,
+            settings.SMTP_PASSWORD,
+            settings.SMTP_USE_TLS,
+        )
+    return LogTransport()
+
+# --- Dispatcher ---
+
+@dataclass
+class AlertBucket:
+    form_id: int
+    opened_at: datetime = field(default_factory=datetime.utcnow)
+    feedback_ids: List[int] = field(default_factory=list)
+
+class AlertDispatcher:
+    """
+    Coalescing negative-feedback alert dispatcher.
+
+    Alerts are pushed onto an asyncio queue owned by a dedicated event-loop
+    thread. The first alert for a form opens a window of
+    ALERT_COALESCE_SECONDS; everything arriving for that form during the
+    window is folded into one email ("5 negative responses in the last 2
+    minutes"). Emails go to the tenant's active users that have
+    `email_notifications` enabled, with at most ALERT_MAX_CONCURRENT_SENDS
+    deliveries in flight.
+    """
+
+    def __init__(self, transport, window_seconds: float, max_concurrent: int):
+        self.transport = transport
+        self.window_seconds = window_seconds
+        self.max_concurrent = max_concurrent
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._buckets: Dict[int, AlertBucket] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._sends: set = set()
+        self._consumer: Optional[asyncio.Task] = None
+
+    # Thread-safe API
+
+    def enqueue(self, form_id: int, feedback_id: int) -> None:
+        self._ensure_started()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (form_id, feedback_id))
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """
+        Flush open windows immediately, wait for in-flight sends and stop.
+        """
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.error(f"Alert dispatcher did not drain cleanly: {e}")
+        # Finish the consumer on its own loop before closing it
+        stopped = asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self._loop)
+        try:
+            stopped.result(timeout=5)
+        except Exception as e:
+            logger.error(f"Alert dispatcher tasks did not stop cleanly: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+        self._started.clear()
+
+    # Event loop side
+
+    def _ensure_started(self) -> None:
+        if self._started.is_set():
+            return
+        with self._lock:
+            if self._started.is_set():
+                return
+            self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+            self._thread.start()
+            self._started.wait()
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._consumer = self._loop.create_task(self._consume())
+        self._started.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _consume(self) -> None:
+        while True:
+            form_id, feedback_id = await self._queue.get()
+            bucket = self._buckets.get(form_id)
+            if bucket is None:
+                bucket = self._buckets[form_id] = AlertBucket(form_id=form_id)
+                self._timers[form_id] = self._loop.call_later(self.window_seconds, self._close_window, form_id)
+            bucket.feedback_ids.append(feedback_id)
+
+    def _close_window(self, form_id: int) -> None:
+        self._timers.pop(form_id, None)
+        bucket = self._buckets.pop(form_id, None)
+        if bucket:
+            task = self._loop.create_task(self._deliver(bucket))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _drain(self) -> None:
+        while not self._queue.empty():
+            await asyncio.sleep(0)
+        for form_id, timer in list(self._timers.items()):
+            timer.cancel()
+            self._close_window(form_id)
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+
+    async def _cancel_tasks(self) -> None:
+        """
+        Cancel the queue consumer (and any send a timed-out drain left
+        behind) and wait until they have finished.
+        """
+        tasks = [t for t in (self._consumer, *self._sends) if t and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._consumer = None
+
+    async def _deliver(self, bucket: AlertBucket) -> None:
+        try:
+            messages = await asyncio.to_thread(self._build_messages, bucket)
+        except Exception as e:
+            logger.error(f"Could not build alerts for form {bucket.form_id}: {e}", exc_info=True)
+            return
+        await asyncio.gather(*[self._send(m) for m in messages])
+
+    async def _send(self, message: EmailMessage) -> None:
+        async with self._semaphore:
+            try:
+                await asyncio.to_thread(self.transport.send, message)
+            except Exception as e:
+                logger.error(f"Failed to send alert email to {message['To']}: {e}")
+
+    def _build_messages(self, bucket: AlertBucket) -> List[EmailMessage]:
+        with Session(engine) as db:
+            form = db.get(Form, bucket.form_id)
+            if not form:
+                return []
+            recipients = db.exec(
+                select(User.email)
+                .where(User.tenant_id == form.tenant_id)
+                .where(User.is_active == True)
+                .where(User.email_notifications == True)
+            ).all()
+            title = form.title
+
+        count = len(bucket.feedback_ids)
+        minutes = max(1, round((datetime.utcnow() - bucket.opened_at).total_seconds() / 60))
+        if count == 1:
+            subject = f"Negative feedback received on \"{title}\""
+        else:
+            subject = f"{count} negative responses in the last {minutes} minute{'s' if minutes != 1 else ''} on \"{title}\""
+        body = (
+            f"{subject}.\n\n"
+            f"Response IDs: {', '.join(str(i) for i in bucket.feedback_ids)}\n\n"
+            f"Review them in your dashboard: {settings.FRONTEND_URL}\n"
+        )
+
+        messages = []
+        for email in recipients:
+            message = EmailMessage()
+            message["From"] = settings.ALERTS_FROM_EMAIL
+            message["To"] = email
+            message["Subject"] = subject
+            message.set_content(body)
+            messages.append(message)
+        return messages
+
+alert_dispatcher = AlertDispatcher(
+    transport=get_transport(),
+    window_seconds=settings.ALERT_COALESCE_SECONDS,
+    max_concurrent=settings.ALERT_MAX_CONCURRENT_SENDS,
+)
@@ -0,0 +1,153 @@
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+from app.core.config import settings
+from app.core.streams import ChunkBuffer
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = "v1" # Bump when the rendering below changes
+
+# Printable sheet: A4 at 150 dpi, 2 x 3 codes per page
+PAGE_SIZE = (1240, 1754)
+GRID = (2, 3)
+QR_SIZE = 440
+
+def qr_url(form_slug: str, location_id: int) -> str:
+    return f"{settings.FRONTEND_URL}/f/{form_slug}?loc={location_id}"
+
+def render_png(url: str) -> bytes:
+    """
+    Module-level so it can run in worker processes.
+    """
+    buf = io.BytesIO()
+    qrcode.make(url).save(buf)
+    return buf.getvalue()
+
+def render_sheet(entries: List[tuple]) -> Image.Image:
+    """
+    Lay out up to GRID codes with their labels on one 1-bit page.
+    `entries` are (url, title, subtitle) tuples.
+    """
+    page = Image.new("1", PAGE_SIZE, 1)
+    draw = ImageDraw.Draw(page)
+    title_font = ImageFont.load_default(size=28)
+    subtitle_font = ImageFont.load_default(size=22)
+    cell_w, cell_h = PAGE_SIZE[0] // GRID[0], PAGE_SIZE[1] // GRID[1]
+    for i, (url, title, subtitle) in enumerate(entries):
+        col, row = i % GRID[0], i // GRID[0]
+        x, y = col * cell_w, row * cell_h
+        code = qrcode.make(url).get_image().convert("1").resize((QR_SIZE, QR_SIZE), Image.NEAREST)
+        page.paste(code, (x + (cell_w - QR_SIZE) // 2, y + 30))
+        draw.text((x + cell_w // 2, y + QR_SIZE + 40), title[:40], font=title_font, fill=0, anchor="mt")
+        draw.text((x + cell_w // 2, y + QR_SIZE + 75), subtitle[:48], font=subtitle_font, fill=0, anchor="mt")
+    return page
+
+def safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", value).strip("_") or "qr"
+
+@dataclass
+class QRItem:
+    url: str
+    filename: str # Path inside the ZIP
+    title: str
+    subtitle: str
+
+class QRService:
+    """
+    QR code rendering with a content-addressed PNG cache.
+
+    A PNG depends only on its URL (FRONTEND_URL, form slug, location ID), so it
+    is stored as <QR_CACHE_DIR>/<sha256[:2]>/<sha256>.png and never re-rendered.
+    Bulk exports render the missing codes / sheet pages in a process pool.
+    """
+
+    def __init__(self, cache_dir: str, processes: int):
+        self.cache_dir = cache_dir
+        self.processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(url: str) -> str:
+        return hashlib.sha256(f"{CACHE_VERSION}|{url}".encode()).hexdigest()
+
+    def cache_path(self, url: str) -> str:
+        digest = self.content_hash(url)
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.png")
+
+    def _store(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes)
+            return self._pool
+
+    def _map(self, func, items: list) -> list:
+        if self.processes <= 0 or len(items) < 2:
+            return [func(i) for i in items]
+        chunksize = max(1, len(items) // (self.processes * 4))
+        return list(self._get_pool().map(func, items, chunksize=chunksize))
+
+    def get_png(self, url: str) -> str:
+        """
+        Path of the cached PNG for `url`, rendering it on first use.
+        """
+        path = self.cache_path(url)
+        if not os.path.exists(path):
+            self._store(path, render_png(url))
+        return path
+
+    def ensure_cached(self, urls: List[str]) -> None:
+        missing = list({u for u in urls if not os.path.exists(self.cache_path(u))})
+        for url, data in zip(missing, self._map(render_png, missing)):
+            self._store(self.cache_path(url), data)
+
+    def iter_zip(self, items: List[QRItem]) -> Iterator[bytes]:
+        """
+        Stream a ZIP of cached PNGs. PNG is already compressed, so entries are stored.
+        """
+        self.ensure_cached([i.url for i in items])
+        sink = ChunkBuffer()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+            for item in items:
+                archive.write(self.cache_path(item.url), arcname=item.filename)
+                yield sink.drain()
+        yield sink.drain()
+
+    def build_pdf(self, items: List[QRItem]) -> bytes:
+        """
+        Printable multi-page PDF sheet with labels under each code.
+        """
+        per_page = GRID[0] * GRID[1]
+        pages = [
+            [(i.url, i.title, i.subtitle) for i in items[n:n + per_page]]
+            for n in range(0, len(items), per_page)
+        ]
+        images = self._map(render_sheet, pages)
+        buf = io.BytesIO()
+        images[0].save(buf, "PDF", resolution=150, save_all=True, append_images=images[1:])
+        return buf.getvalue()
+
+    def shutdown(self) -> None:
+        if self._pool:
+            self._pool.shutdown()
+            self._pool = None
+
+qr_service = QRService(settings.QR_CACHE_DIR, settings.QR_RENDER_PROCESSES)
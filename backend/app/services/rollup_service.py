@@ -0,0 +1,368 @@
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import case, delete, insert, literal, or_, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, func
+from app.core.config import settings
+from app.db.dialect import as_date, day_bucket, json_number
+from app.db.session import engine
+from app.models.form import Form, Values
+from app.models.rollup import FeedbackRollup, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "values"
+SENTIMENTS = ("positive", "negative", "neutral")
+
+def day_start(value: datetime) -> datetime:
+    return datetime.combine(value.date(), time.min)
+
+def rating_field_ids(form: Optional[Form]) -> List[str]:
+    if not form:
+        return []
+    return [
+        f["id"] for f in (form.form_schema or {}).get("fields", [])
+        if f.get("type") == "rating" and f.get("id")
+    ]
+
+def score_key(score: Any) -> Any:
+    score = float(score)
+    return int(score) if score.is_integer() else score
+
+class RollupService:
+    """
+    Incremental (form, location, day, field) rollup of feedback.
+
+    A watermark on Values.updated_at records how far the rollup has been
+    built. Each run rebuilds, from scratch, the days touched by rows created
+    or changed since (late kiosk replays, sentiment scoring and rescoring
+    included) with grouped queries, and stores a `frontier`: every day before
+    it is complete in the rollup. Readers take whole days before the frontier
+    from the rollup and only scan raw rows for the rest (the current, partial
+    day).
+
+    The watermark trails the clock by ROLLUP_SETTLE_SECONDS so rows from
+    transactions still in flight (group-commit batches, replays) are not
+    skipped when they commit out of order.
+    """
+
+    def __init__(self, interval_seconds: float, settle_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.settle_seconds = settle_seconds
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # --- Building ---
+
+    def _rebuild_days(self, db: Session, form_id: int, fields: List[str], day_from: date, day_to: date) -> int:
+        """
+        Recompute the buckets of one form for days [day_from, day_to).
+        """
+        dialect = db.get_bind().dialect.name
+        db.exec(
+            delete(FeedbackRollup)
+            .where(FeedbackRollup.form_id == form_id)
+            .where(FeedbackRollup.day >= day_from)
+            .where(FeedbackRollup.day < day_to)
+        )
+        filters = [
+            Values.form_id == form_id,
+            Values.created_at >= datetime.combine(day_from, time.min),
+            Values.created_at < datetime.combine(day_to, time.min),
+        ]
+        day = day_bucket(Values.created_at, dialect)
+        location = func.coalesce(Values.location_id, 0)
+
+        buckets: Dict[Tuple[date, int, str], Dict[str, Any]] = {}
+        def bucket(d, loc, field_id):
+            key = (as_date(d), loc, field_id)
+            if key not in buckets:
+                buckets[key] = {
+                    "form_id": form_id, "location_id": loc, "day": key[0], "field_id": field_id,
+                    "count": 0, "sum": 0.0, "histogram": {}, "positive": 0, "negative": 0, "neutral": 0,
+                }
+            return buckets[key]
+
+        totals = db.exec(
+            select(day, location, func.count(), *[
+                func.sum(case((Values.sentiment == s, 1), else_=0)) for s in SENTIMENTS
+            ])
+            .where(*filters)
+            .group_by(day, location)
+        ).all()
+        for d, loc, n, positive, negative, neutral in totals:
+            row = bucket(d, loc, "")
+            row.update(count=n, positive=positive or 0, negative=negative or 0, neutral=neutral or 0)
+
+        if fields:
+            histograms = []
+            for field_id in fields:
+                score = json_number(Values.data, field_id, dialect)
+                histograms.append(
+                    select(literal(field_id), day, location, score, func.count())
+                    .where(*filters)
+                    .where(score.is_not(None))
+                    .group_by(day, location, score)
+                )
+            for field_id, d, loc, score, n in db.exec(union_all(*histograms)).all():
+                row = bucket(d, loc, field_id)
+                row["count"] += n
+                row["sum"] += float(score) * n
+                row["histogram"][str(score_key(score))] = n
+
+        if buckets:
+            db.execute(insert(FeedbackRollup), list(buckets.values()))
+        return len(buckets)
+
+    def run_once(self) -> int:
+        """
+        Roll up rows changed since the watermark. Returns the number of buckets written.
+        """
+        now = datetime.utcnow()
+        # Batched and replayed submissions commit after their updated_at was
+        # taken: only changes older than the settle window are final
+        upper = now - timedelta(seconds=self.settle_seconds)
+        with Session(engine) as db:
+            watermark = db.get(RollupWatermark, WATERMARK)
+            last = watermark.last_updated_at if watermark else None
+            if last is not None and upper <= last:
+                return 0
+
+            changed = [Values.updated_at <= upper]
+            if last is not None:
+                changed.append(Values.updated_at > last)
+            dirty = db.exec(
+                select(Values.form_id, func.min(Values.created_at), func.max(Values.created_at))
+                .where(*changed)
+                .group_by(Values.form_id)
+            ).all()
+            forms = {f.id: f for f in db.exec(select(Form).where(Form.id.in_([d[0] for d in dirty]))).all()}
+            written = 0
+            for form_id, first, last_created in dirty:
+                written += self._rebuild_days(
+                    db, form_id, rating_field_ids(forms.get(form_id)),
+                    first.date(), last_created.date() + timedelta(days=1)
+                )
+
+            # Days before the oldest row changed after the watermark are complete
+            oldest_left = db.exec(select(func.min(Values.created_at)).where(Values.updated_at > upper)).one()
+            frontier = day_start(min(now, oldest_left) if oldest_left else now)
+
+            if watermark is None:
+                db.add(RollupWatermark(name=WATERMARK, last_updated_at=upper, frontier=frontier, updated_at=now))
+            else:
+                result = db.exec(
+                    update(RollupWatermark)
+                    .where(RollupWatermark.name == WATERMARK)
+                    .where(
+                        RollupWatermark.last_updated_at.is_(None) if last is None
+                        else RollupWatermark.last_updated_at == last
+                    )
+                    .values(last_updated_at=upper, frontier=frontier, updated_at=now)
+                )
+                if result.rowcount != 1:
+                    # Another worker rolled up the same rows first
+                    db.rollback()
+                    return 0
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                return 0
+        return written
+
+    def rebuild(self) -> int:
+        """
+        Drop the rollup and build it again from all responses
+        (after changing a form's rating fields).
+        """
+        with Session(engine) as db:
+            db.exec(delete(FeedbackRollup))
+            db.exec(delete(RollupWatermark))
+            db.commit()
+        return self.run_once()
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Feedback rollup failed: {e}", exc_info=True)
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="feedback-rollup", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=30)
+
+    # --- Reading ---
+
+    def get_frontier(self, db: Session) -> Optional[datetime]:
+        watermark = db.get(RollupWatermark, WATERMARK)
+        return watermark.frontier if watermark else None
+
+    def _split(self, db: Session, start: Optional[datetime], end: Optional[datetime]):
+        """
+        Split [start, end] into whole rollup days [day_from, day_to) and the
+        raw-row remainder. Returns (rollup conditions or None, raw conditions).
+        """
+        frontier = self.get_frontier(db)
+        raw = []
+        if start:
+            raw.append(Values.created_at >= start)
+        if end:
+            raw.append(Values.created_at <= end)
+        if frontier is None:
+            return None, raw
+
+        day_from = None
+        if start:
+            day_from = start.date() if start == day_start(start) else start.date() + timedelta(days=1)
+        day_to = frontier.date() if not end else min(frontier.date(), end.date())
+        if day_from is not None and day_from >= day_to:
+            return None, raw
+
+        rollup = [FeedbackRollup.day < day_to]
+        outside = [Values.created_at >= datetime.combine(day_to, time.min)]
+        if day_from is not None:
+            rollup.append(FeedbackRollup.day >= day_from)
+            outside.append(Values.created_at < datetime.combine(day_from, time.min))
+        return rollup, raw + [or_(*outside)]
+
+    def form_stats(
+        self,
+        db: Session,
+        form: Form,
+        location_id: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Total responses, sentiment counts and per-field score histograms.
+        """
+        dialect = db.get_bind().dialect.name
+        fields = rating_field_ids(form)
+        rollup, raw = self._split(db, start, end)
+
+        total = 0
+        sentiment = {s: 0 for s in SENTIMENTS}
+        histograms: Dict[str, Dict[Any, int]] = {f: {} for f in fields}
+
+        if rollup is not None:
+            scope = [FeedbackRollup.form_id == form.id, *rollup]
+            if location_id:
+                scope.append(FeedbackRollup.location_id == location_id)
+            row = db.exec(
+                select(
+                    func.sum(FeedbackRollup.count),
+                    *[func.sum(getattr(FeedbackRollup, s)) for s in SENTIMENTS]
+                ).where(*scope).where(FeedbackRollup.field_id == "")
+            ).one()
+            total += row[0] or 0
+            for s, n in zip(SENTIMENTS, row[1:]):
+                sentiment[s] += n or 0
+            if fields:
+                for field_id, histogram in db.exec(
+                    select(FeedbackRollup.field_id, FeedbackRollup.histogram)
+                    .where(*scope)
+                    .where(FeedbackRollup.field_id.in_(fields))
+                ).all():
+                    merged = histograms[field_id]
+                    for score, n in (histogram or {}).items():
+                        merged[score_key(score)] = merged.get(score_key(score), 0) + n
+
+        scope = [Values.form_id == form.id, *raw]
+        if location_id:
+            scope.append(Values.location_id == location_id)
+        row = db.exec(
+            select(func.count(Values.id), *[
+                func.sum(case((Values.sentiment == s, 1), else_=0)) for s in SENTIMENTS
+            ]).where(*scope)
+        ).one()
+        total += row[0] or 0
+        for s, n in zip(SENTIMENTS, row[1:]):
+            sentiment[s] += n or 0
+        if fields:
+            queries = []
+            for field_id in fields:
+                score = json_number(Values.data, field_id, dialect)
+                queries.append(
+                    select(literal(field_id), score, func.count())
+                    .where(*scope)
+                    .where(score.is_not(None))
+                    .group_by(score)
+                )
+            for field_id, score, n in db.exec(union_all(*queries)).all():
+                merged = histograms[field_id]
+                merged[score_key(score)] = merged.get(score_key(score), 0) + n
+
+        return {"total": total, "sentiment": sentiment, "histograms": histograms}
+
+    def daily_counts(self, db: Session, since: datetime) -> Dict[date, int]:
+        """
+        Responses per UTC day since `since`, across all tenants.
+        """
+        dialect = db.get_bind().dialect.name
+        rollup, raw = self._split(db, since, None)
+        counts: Dict[date, int] = {}
+        if rollup is not None:
+            for d, n in db.exec(
+                select(FeedbackRollup.day, func.sum(FeedbackRollup.count))
+                .where(*rollup)
+                .where(FeedbackRollup.field_id == "")
+                .group_by(FeedbackRollup.day)
+            ).all():
+                counts[as_date(d)] = counts.get(as_date(d), 0) + n
+        day = day_bucket(Values.created_at, dialect)
+        for d, n in db.exec(select(day, func.count(Values.id)).where(*raw).group_by(day)).all():
+            counts[as_date(d)] = counts.get(as_date(d), 0) + n
+        return dict(sorted(counts.items()))
+
+    def tenant_counts(
+        self,
+        db: Session,
+        tenant_ids: Optional[List[int]] = None,
+        since: Optional[datetime] = None,
+    ) -> Dict[int, int]:
+        """
+        Responses per tenant (all time, or since `since`).
+        """
+        rollup, raw = self._split(db, since, None)
+        counts: Dict[int, int] = {}
+        if rollup is not None:
+            query = (
+                select(Form.tenant_id, func.sum(FeedbackRollup.count))
+                .join(Form, Form.id == FeedbackRollup.form_id)
+                .where(*rollup)
+                .where(FeedbackRollup.field_id == "")
+                .group_by(Form.tenant_id)
+            )
+            if tenant_ids is not None:
+                query = query.where(Form.tenant_id.in_(tenant_ids))
+            for tenant_id, n in db.exec(query).all():
+                counts[tenant_id] = counts.get(tenant_id, 0) + (n or 0)
+        query = (
+            select(Form.tenant_id, func.count(Values.id))
+            .join(Form, Form.id == Values.form_id)
+            .where(*raw)
+            .group_by(Form.tenant_id)
+        )
+        if tenant_ids is not None:
+            query = query.where(Form.tenant_id.in_(tenant_ids))
+        for tenant_id, n in db.exec(query).all():
+            counts[tenant_id] = counts.get(tenant_id, 0) + n
+        return counts
+
+rollup_service = RollupService(
+    interval_seconds=settings.ROLLUP_INTERVAL_SECONDS,
+    settle_seconds=settings.ROLLUP_SETTLE_SECONDS,
+)
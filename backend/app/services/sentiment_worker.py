@@ -0,0 +1,172 @@
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, select
+from app.core import ai
+from app.core.config import settings
+from app.core.idempotency import recent_submissions
+from app.db.session import engine
+from app.models.form import Values
+from app.services.notification_service import alert_dispatcher
+
+logger = logging.getLogger(__name__)
+
+# Queued status -> status while a worker scores the row. "rescore" marks
+# historical rows to score again (score_sentiment --rescore-all); they never alert.
+CLAIMED = {"pending": "processing", "rescore": "rescoring"}
+
+class SentimentWorker:
+    """
+    Scores responses stored with analysis_status="pending".
+
+    The DB is the queue: each cycle claims up to `batch_size` pending rows
+    with a compare-and-set UPDATE to "processing" (so several workers, on
+    any database, can share the table), scores them in a process pool,
+    writes the results back in one executemany UPDATE and then hands
+    negative responses to the alert dispatcher. Claims older than
+    `claim_timeout_seconds` are released again.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        batch_size: int,
+        poll_seconds: float,
+        send_alerts: bool = True,
+        claim_timeout_seconds: float = 300.0,
+    ):
+        self.processes = processes
+        self.send_alerts = send_alerts
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _score(self, texts: List[str]) -> List[str]:
+        if self.processes <= 0:
+            return ai.analyze_batch(texts)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processes)
+        chunk = max(1, -(-len(texts) // self.processes))
+        chunks = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
+        return [s for scored in self._pool.map(ai.analyze_batch, chunks) for s in scored]
+
+    def _claim(self, db: Session, ids: List[int], status: str) -> List[int]:
+        """
+        Move rows from `status` to its in-progress state; only the IDs this
+        worker actually switched are returned, so concurrent workers never
+        score (or alert on) the same row twice.
+        """
+        if not ids:
+            return []
+        result = db.exec(
+            update(Values)
+            .where(Values.id.in_(ids))
+            .where(Values.analysis_status == status)
+            .values(analysis_status=CLAIMED[status])
+            .returning(Values.id)
+        )
+        return [row[0] for row in result]
+
+    def _release_stale(self, db: Session) -> None:
+        """
+        Hand rows claimed by a worker that died mid-batch back to the queue.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.claim_timeout_seconds)
+        for status, claimed in CLAIMED.items():
+            db.exec(
+                update(Values)
+                .where(Values.analysis_status == claimed)
+                .where(Values.updated_at < cutoff)
+                .values(analysis_status=status)
+            )
+
+    def run_once(self) -> int:
+        """
+        Process one batch of pending rows. Returns the number scored.
+        """
+        with Session(engine) as db:
+            self._release_stale(db)
+            query = (
+                select(Values.id, Values.analysis_status)
+                .where(Values.analysis_status.in_(tuple(CLAIMED)))
+                .order_by(Values.id)
+                .limit(self.batch_size)
+            )
+            if engine.dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+            candidates = db.exec(query).all()
+            if not candidates:
+                db.commit()
+                return 0
+
+            # Claim with a compare-and-set UPDATE and commit right away so
+            # other workers skip these rows while they are being scored
+            alerting = set(self._claim(db, [r.id for r in candidates if r.analysis_status == "pending"], "pending"))
+            claimed = alerting | set(self._claim(db, [r.id for r in candidates if r.analysis_status == "rescore"], "rescore"))
+            db.commit()
+            if not claimed:
+                return 0
+
+            rows = db.exec(
+                select(Values.id, Values.form_id, Values.data, Values.idempotency_key)
+                .where(Values.id.in_(claimed))
+                .order_by(Values.id)
+            ).all()
+            sentiments = self._score([ai.feedback_text(r.data) for r in rows])
+
+            db.connection().execute(
+                update(Values.__table__)
+                .where(Values.__table__.c.id == bindparam("row_id"))
+                .values(sentiment=bindparam("row_sentiment"), analysis_status="complete"),
+                [{"row_id": r.id, "row_sentiment": s} for r, s in zip(rows, sentiments)],
+            )
+            db.commit()
+
+        for r, sentiment in zip(rows, sentiments):
+            # Keep cached retry answers current
+            if r.idempotency_key:
+                recent_submissions.update((r.form_id, r.idempotency_key), sentiment=sentiment, analysis_status="complete")
+
+        # Negative Feedback Alerts (new responses only, never on a rescore)
+        for r, sentiment in zip(rows, sentiments):
+            if sentiment == "negative" and self.send_alerts and r.id in alerting:
+                alert_dispatcher.enqueue(r.form_id, r.id)
+        return len(rows)
+
+    def run_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                scored = self.run_once()
+            except Exception as e:
+                logger.error(f"Sentiment batch failed: {e}", exc_info=True)
+                scored = 0
+            if scored < self.batch_size:
+                # Queue drained: wait for new submissions
+                self._stop.wait(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="sentiment-worker", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_seconds + 5)
+        if self._pool:
+            self._pool.shutdown()
+
+sentiment_worker = SentimentWorker(
+    processes=settings.SENTIMENT_WORKER_PROCESSES,
+    batch_size=settings.SENTIMENT_WORKER_BATCH_SIZE,
+    poll_seconds=settings.SENTIMENT_WORKER_POLL_SECONDS,
+    claim_timeout_seconds=settings.SENTIMENT_CLAIM_TIMEOUT_SECONDS,
+)
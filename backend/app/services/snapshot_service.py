@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from typing import Optional
+from sqlmodel import Session, select
+from app.core.config import settings
+from app.models.form import Form, PublicFormRead
+
+logger = logging.getLogger(__name__)
+
+SAFE_SLUG = re.compile(r"^[A-Za-z0-9_-]+$")
+
+def _atomic_write(path: str, data: bytes) -> None:
+    # Write next to the target and rename, so readers never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+class SnapshotService:
+    """
+    Static JSON snapshots of published forms (form + tenant branding), served
+    by the /snapshots mount without touching the database:
+
+        snapshots/forms/<slug>/current.json    latest version, revalidated
+        snapshots/forms/<slug>/<version>.json  immutable, content-addressed
+
+    Each file has a pre-compressed `.gz` sibling. The latest
+    SNAPSHOT_KEEP_VERSIONS versions are kept for clients mid-flight.
+    """
+
+    def __init__(self, root: str, keep_versions: int):
+        self.root = root
+        self.keep_versions = keep_versions
+
+    def _form_dir(self, slug: str) -> Optional[str]:
+        if not SAFE_SLUG.match(slug or ""):
+            return None
+        return os.path.join(self.root, "forms", slug)
+
+    def publish(self, form: Form) -> Optional[str]:
+        """
+        Write the snapshot of a published form (or delete it if unpublished).
+        Returns the snapshot version.
+        """
+        if not form.is_published:
+            self.remove(form.slug)
+            return None
+        directory = self._form_dir(form.slug)
+        if directory is None:
+            logger.warning(f"Not snapshotting form {form.id}: unsafe slug {form.slug!r}")
+            return None
+
+        body = PublicFormRead.model_validate(form).model_dump_json().encode()
+        compressed = gzip.compress(body, mtime=0)
+        version = hashlib.sha256(body).hexdigest()[:16]
+
+        os.makedirs(directory, exist_ok=True)
+        versioned = os.path.join(directory, f"{version}.json")
+        if os.path.exists(versioned):
+            os.utime(versioned) # Reverted to an older version: keep it from being pruned
+        else:
+            _atomic_write(versioned + ".gz", compressed)
+            _atomic_write(versioned, body)
+        # .gz first: a client never gets a compressed copy older than the plain one
+        _atomic_write(os.path.join(directory, "current.json.gz"), compressed)
+        _atomic_write(os.path.join(directory, "current.json"), body)
+        self._prune(directory)
+        return version
+
+    def remove(self, slug: str) -> None:
+        directory = self._form_dir(slug)
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _prune(self, directory: str) -> None:
+        versions = [
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.endswith(".json") and not name.startswith(("current.", "."))
+        ]
+        versions.sort(key=os.path.getmtime, reverse=True)
+        for path in versions[self.keep_versions:]:
+            for stale in (path, path + ".gz"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+    def sync_form(self, form: Form, old_slug: Optional[str] = None) -> None:
+        """
+        Bring a form's snapshot in line after an edit. Never fails the edit.
+        """
+        try:
+            if old_slug and old_slug != form.slug:
+                self.remove(old_slug)
+            self.publish(form)
+        except Exception as e:
+            logger.error(f"Could not update snapshot for form {form.id}: {e}", exc_info=True)
+
+    def sync_tenant(self, db: Session, tenant_id: int) -> None:
+        """
+        Re-render every published form of a tenant (branding is embedded).
+        """
+        forms = db.exec(select(Form).where(Form.tenant_id == tenant_id).where(Form.is_published == True)).all()
+        for form in forms:
+            self.sync_form(form)
+
+snapshot_service = SnapshotService(settings.SNAPSHOT_DIR, settings.SNAPSHOT_KEEP_VERSIONS)
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlmodel import Session, select, func
+from app.models.form import Form
+from app.models.location import Location
+from app.models.onboarding import Onboarding
+from app.models.plan import SubscriptionPlan
+from app.models.tenant import Tenant
+from app.models.user import User, UserRole
+from app.services.rollup_service import rollup_service
+
+@dataclass
+class TenantSummary:
+    admin_email: Optional[str] = None
+    plan_name: Optional[str] = None
+    onboarding_id: Optional[int] = None
+    forms_count: int = 0
+    locations_count: int = 0
+    submissions_count: int = 0
+    recent_submissions_count: int = 0 # Only filled when `recent_since` is given
+
+class TenantSummaryService:
+    """
+    Admin email, plan, onboarding and usage counts for a page of tenants.
+
+    The query count does not depend on the page size: one query joins the
+    tenants to per-tenant grouped subqueries (forms, locations, first tenant
+    admin), and submissions come from the rollup in a few grouped queries.
+    """
+
+    def summaries(
+        self,
+        db: Session,
+        tenant_ids: List[int],
+        recent_since: Optional[datetime] = None,
+    ) -> Dict[int, TenantSummary]:
+        if not tenant_ids:
+            return {}
+
+        forms = (
+            select(Form.tenant_id, func.count(Form.id).label("n"))
+            .where(Form.tenant_id.in_(tenant_ids))
+            .group_by(Form.tenant_id)
+            .subquery()
+        )
+        locations = (
+            select(Location.tenant_id, func.count(Location.id).label("n"))
+            .where(Location.tenant_id.in_(tenant_ids))
+            .group_by(Location.tenant_id)
+            .subquery()
+        )
+        # Oldest tenant admin when there are several
+        admins = (
+            select(User.tenant_id, func.min(User.id).label("user_id"))
+            .where(User.tenant_id.in_(tenant_ids))
+            .where(User.role == UserRole.TENANT_ADMIN)
+            .group_by(User.tenant_id)
+            .subquery()
+        )
+        rows = db.exec(
+            select(Tenant.id, User.email, SubscriptionPlan.name, Onboarding.id, forms.c.n, locations.c.n)
+            .select_from(Tenant)
+            .outerjoin(admins, admins.c.tenant_id == Tenant.id)
+            .outerjoin(User, User.id == admins.c.user_id)
+            .outerjoin(SubscriptionPlan, SubscriptionPlan.id == Tenant.plan_id)
+            .outerjoin(Onboarding, Onboarding.tenant_id == Tenant.id)
+            .outerjoin(forms, forms.c.tenant_id == Tenant.id)
+            .outerjoin(locations, locations.c.tenant_id == Tenant.id)
+            .where(Tenant.id.in_(tenant_ids))
+        ).all()
+
+        submissions = rollup_service.tenant_counts(db, tenant_ids)
+        recent = rollup_service.tenant_counts(db, tenant_ids, since=recent_since) if recent_since else {}
+        return {
+            tenant_id: TenantSummary(
+                admin_email=email,
+                plan_name=plan_name,
+                onboarding_id=onboarding_id,
+                forms_count=forms_count or 0,
+                locations_count=locations_count or 0,
+                submissions_count=submissions.get(tenant_id, 0),
+                recent_submissions_count=recent.get(tenant_id, 0),
+            )
+            for tenant_id, email, plan_name, onboarding_id, forms_count, locations_count in rows
+        }
+
+tenant_summary_service = TenantSummaryService()
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import case
+from sqlmodel import Session, select, func
+from app.core.config import settings
+from app.db.dialect import as_datetime, json_number, time_bucket
+from app.models.form import Form, Values
+
+BUCKETS = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+DEFAULT_SPANS = {"hour": timedelta(days=2), "day": timedelta(days=30), "week": timedelta(weeks=26)}
+SENTIMENTS = ("positive", "negative", "neutral")
+
+def floor_local(value: datetime, bucket: str) -> datetime:
+    """
+    Bucket start of a naive wall-clock time (same rules as `time_bucket`).
+    """
+    if bucket == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+class TimeseriesService:
+    """
+    Response time series bucketed by hour, day or week in the caller's time
+    zone. Bucketing and aggregation run in SQL; empty buckets are filled in
+    here so charts get one point per bucket.
+    """
+
+    def __init__(self, max_buckets: int):
+        self.max_buckets = max_buckets
+
+    def resolve_range(self, bucket: str, tz: str, start: Optional[datetime], end: Optional[datetime]):
+        """
+        Validate the request and return naive-UTC (start, end). Naive inputs
+        are taken as UTC. Raises ValueError with a client-facing message.
+        """
+        try:
+            ZoneInfo(tz)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown time zone: {tz}")
+
+        def utc(value: datetime) -> datetime:
+            return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+        end = utc(end) if end else datetime.utcnow()
+        start = utc(start) if start else end - DEFAULT_SPANS[bucket]
+        if start > end:
+            raise ValueError("start must be before end")
+        if (end - start) / BUCKETS[bucket] > self.max_buckets:
+            raise ValueError(f"Range too large: at most {self.max_buckets} {bucket} buckets")
+        return start, end
+
+    def bucket_starts(self, zone: ZoneInfo, bucket: str, start: datetime, end: datetime) -> List[datetime]:
+        """
+        Local bucket starts covering the naive-UTC range [start, end].
+        """
+        def local(at: datetime) -> datetime:
+            return at.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
+
+        if bucket == "hour":
+            # Walk UTC hours: DST days have 23 or 25 local hours
+            starts = []
+            at = start.replace(minute=0, second=0, microsecond=0)
+            while at <= end:
+                key = floor_local(local(at), "hour")
+                if not starts or starts[-1] != key:
+                    starts.append(key)
+                at += BUCKETS["hour"]
+            return starts
+
+        starts, key, last = [], floor_local(local(start), bucket), floor_local(local(end), bucket)
+        while key <= last:
+            starts.append(key)
+            key += BUCKETS[bucket]
+        return starts
+
+    def series(
+        self,
+        db: Session,
+        filters: list,
+        bucket: str,
+        metric: str,
+        tz: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        form: Optional[Form] = None,
+    ) -> Dict[str, Any]:
+        """
+        One point per bucket. `metric` is 'count', 'sentiment' or
+        'avg:<field id>' (single-form series only). Raises ValueError with a
+        client-facing message.
+        """
+        start, end = self.resolve_range(bucket, tz, start, end)
+        field_id = None
+        if metric.startswith("avg:"):
+            field_id = metric[4:]
+            fields = (form.form_schema or {}).get("fields", []) if form else []
+            if form is None:
+                raise ValueError("avg:<field> is only available for a single form")
+            if not any(f.get("id") == field_id for f in fields):
+                raise ValueError(f"Unknown field: {field_id}")
+            metric = "avg"
+        elif metric not in ("count", "sentiment"):
+            raise ValueError("metric must be count, sentiment or avg:<field>")
+
+        zone = ZoneInfo(tz)
+        dialect = db.get_bind().dialect.name
+        columns = [time_bucket(Values.created_at, bucket, tz, dialect, start, end).label("bucket")]
+        if metric == "avg":
+            columns.append(json_number(Values.data, field_id, dialect).label("score"))
+        elif metric == "sentiment":
+            columns.append(Values.sentiment.label("sentiment"))
+
+        # Group on the subquery column so the bucket expression is only rendered once
+        rows = select(*columns).where(
+            *filters, Values.created_at >= start, Values.created_at <= end
+        ).subquery()
+        aggregates = [func.count()]
+        if metric == "avg":
+            aggregates = [func.count(rows.c.score), func.avg(rows.c.score)]
+        elif metric == "sentiment":
+            aggregates += [func.sum(case((rows.c.sentiment == s, 1), else_=0)) for s in SENTIMENTS]
+        results = db.exec(select(rows.c.bucket, *aggregates).group_by(rows.c.bucket)).all()
+
+        found = {as_datetime(row[0]).replace(tzinfo=None): row[1:] for row in results}
+        points = []
+        for key in self.bucket_starts(zone, bucket, start, end):
+            values = found.get(key)
+            point = {"t": key.replace(tzinfo=zone), "count": values[0] if values else 0, "value": None}
+            if metric == "count":
+                point["value"] = point["count"]
+            elif metric == "avg" and values and values[1] is not None:
+                point["value"] = round(float(values[1]), 2)
+            elif metric == "sentiment":
+                point["sentiment"] = {s: (values[i + 1] or 0) if values else 0 for i, s in enumerate(SENTIMENTS)}
+            points.append(point)
+        return {"bucket": bucket, "metric": metric, "field_id": field_id, "tz": tz, "start": start, "end": end, "points": points}
+
+timeseries_service = TimeseriesService(max_buckets=settings.TIMESERIES_MAX_BUCKETS)
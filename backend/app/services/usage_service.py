@@ -0,0 +1,168 @@
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlmodel import Session, select, func, update
+from sqlalchemy.exc import IntegrityError
+from app.models.form import Form, Values
+from app.models.usage import TenantUsageCounter
+
+logger = logging.getLogger(__name__)
+
+def month_bounds(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Return the [start, end) UTC datetimes of the month containing `now`.
+    """
+    now = now or datetime.utcnow()
+    start = datetime(now.year, now.month, 1)
+    if now.month == 12:
+        end = datetime(now.year + 1, 1, 1)
+    else:
+        end = datetime(now.year, now.month + 1, 1)
+    return start, end
+
+def period_key(now: Optional[datetime] = None) -> str:
+    now = now or datetime.utcnow()
+    return f"{now.year:04d}-{now.month:02d}"
+
+class UsageService:
+    """
+    Materialized per-tenant monthly response counters.
+
+    The counter row for (tenant_id, period) is bumped with a conditional
+    UPDATE in the same transaction as the `Values` insert, so quota checks
+    are O(1) and the row lock serializes concurrent submitters.
+    """
+
+    def _count_responses(self, db: Session, start: datetime, end: datetime, tenant_id: Optional[int] = None):
+        query = (
+            select(Form.tenant_id, func.count(Values.id))
+            .join(Form, Values.form_id == Form.id)
+            .where(Values.created_at >= start)
+            .where(Values.created_at < end)
+            .group_by(Form.tenant_id)
+        )
+        if tenant_id is not None:
+            query = query.where(Form.tenant_id == tenant_id)
+        return {row[0]: row[1] for row in db.exec(query).all()}
+
+    def _ensure_counter(self, db: Session, tenant_id: int, now: datetime) -> None:
+        """
+        Create the counter row for the current month if it is missing.
+        Seeded from `Values` so counters stay correct when introduced mid-month.
+        """
+        period = period_key(now)
+        if db.get(TenantUsageCounter, (tenant_id, period)):
+            return
+        start, end = month_bounds(now)
+        seed = self._count_responses(db, start, end, tenant_id).get(tenant_id, 0)
+        try:
+            with db.begin_nested():
+                db.add(TenantUsageCounter(tenant_id=tenant_id, period=period, responses_count=seed))
+        except IntegrityError:
+            # Another worker created the row first
+            pass
+
+    def reserve_responses(
+        self,
+        db: Session,
+        tenant_id: int,
+        limit: Optional[int] = None,
+        amount: int = 1,
+        at: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Atomically add `amount` responses to the tenant's counter for the
+        month containing `at` (default: now). Returns False (and changes
+        nothing) if that would exceed `limit`. Must be committed together
+        with the inserted `Values` rows.
+        """
+        now = datetime.utcnow()
+        at = at or now
+        period = period_key(at)
+        self._ensure_counter(db, tenant_id, at)
+
+        statement = (
+            update(TenantUsageCounter)
+            .where(TenantUsageCounter.tenant_id == tenant_id)
+            .where(TenantUsageCounter.period == period)
+            .values(
+                responses_count=TenantUsageCounter.responses_count + amount,
+                updated_at=now
+            )
+        )
+        if limit is not None:
+            statement = statement.where(TenantUsageCounter.responses_count + amount <= limit)
+
+        result = db.exec(statement)
+        return result.rowcount == 1
+
+    def reserve_available(
+        self,
+        db: Session,
+        tenant_id: int,
+        limit: Optional[int],
+        amount: int,
+        at: Optional[datetime] = None,
+    ) -> int:
+        """
+        Reserve as many of `amount` responses as the quota of the month
+        containing `at` (default: now) allows. Returns the number actually reserved.
+        """
+        if self.reserve_responses(db, tenant_id, limit=limit, amount=amount, at=at):
+            return amount
+        # Partly available: read what is left with the counter row locked,
+        # then take exactly that in one conditional UPDATE
+        used = db.exec(
+            select(TenantUsageCounter.responses_count)
+            .where(TenantUsageCounter.tenant_id == tenant_id)
+            .where(TenantUsageCounter.period == period_key(at))
+            .with_for_update()
+        ).one()
+        granted = max(0, min(amount, limit - used))
+        if granted and self.reserve_responses(db, tenant_id, limit=limit, amount=granted, at=at):
+            return granted
+        return 0
+
+    def get_monthly_responses(self, db: Session, tenant_id: int, now: Optional[datetime] = None) -> int:
+        counter = db.get(TenantUsageCounter, (tenant_id, period_key(now)))
+        return counter.responses_count if counter else 0
+
+    def rebuild_counters(self, db: Session, now: Optional[datetime] = None, tenant_id: Optional[int] = None) -> Dict[int, int]:
+        """
+        Reconciliation job: recompute the counters for the month containing
+        `now` from `Values` and overwrite whatever is stored.
+        """
+        now = now or datetime.utcnow()
+        period = period_key(now)
+        start, end = month_bounds(now)
+
+        # Lock the counter rows before recounting (row locks on Postgres, the
+        # write lock on SQLite): reservations that commit between the COUNT
+        # and the overwrite would otherwise be lost
+        lock = update(TenantUsageCounter).where(TenantUsageCounter.period == period).values(updated_at=datetime.utcnow())
+        if tenant_id is not None:
+            lock = lock.where(TenantUsageCounter.tenant_id == tenant_id)
+        db.exec(lock)
+
+        counts = self._count_responses(db, start, end, tenant_id)
+
+        query = select(TenantUsageCounter).where(TenantUsageCounter.period == period)
+        if tenant_id is not None:
+            query = query.where(TenantUsageCounter.tenant_id == tenant_id)
+        existing = {c.tenant_id: c for c in db.exec(query).all()}
+
+        for tid in set(counts) | set(existing):
+            actual = counts.get(tid, 0)
+            counter = existing.get(tid)
+            if counter is None:
+                counter = TenantUsageCounter(tenant_id=tid, period=period)
+            elif counter.responses_count != actual:
+                logger.warning(f"Usage counter drift for tenant {tid} ({period}): {counter.responses_count} -> {actual}")
+            counter.responses_count = actual
+            counter.updated_at = datetime.utcnow()
+            db.add(counter)
+
+        db.commit()
+        return counts
+
+usage_service = UsageService()
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import re
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.idempotency import RecentKeyCache
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+BOOLEAN_STRINGS = {"true": True, "yes": True, "1": True, "false": False, "no": False, "0": False}
+
+class FormValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+# --- Field converters ---
+# Each takes (field definition) and returns a function raw value -> normalized
+# value, raising ValueError with a user-facing message.
+
+def _rating(field: Dict[str, Any]) -> Callable[[Any], int]:
+    low, high = int(field.get("min", 1)), int(field.get("max", 5))
+    def convert(value: Any) -> int:
+        if isinstance(value, bool):
+            raise ValueError("must be a number")
+        if isinstance(value, str):
+            value = value.strip()
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError("must be a number")
+        if not number.is_integer() or not low <= number <= high:
+            raise ValueError(f"must be a whole number between {low} and {high}")
+        return int(number)
+    return convert
+
+def _boolean(field: Dict[str, Any]) -> Callable[[Any], bool]:
+    def convert(value: Any) -> bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in BOOLEAN_STRINGS:
+            return BOOLEAN_STRINGS[value.strip().lower()]
+        raise ValueError("must be yes or no")
+    return convert
+
+def _text(field: Dict[str, Any]) -> Callable[[Any], str]:
+    def convert(value: Any) -> str:
+        if not isinstance(value, str):
+            raise ValueError("must be text")
+        return value
+    return convert
+
+def _email(field: Dict[str, Any]) -> Callable[[Any], str]:
+    def convert(value: Any) -> str:
+        if not isinstance(value, str) or not EMAIL_RE.match(value.strip()):
+            raise ValueError("must be an email address")
+        return value.strip()
+    return convert
+
+def _date(field: Dict[str, Any]) -> Callable[[Any], str]:
+    def convert(value: Any) -> str:
+        try:
+            return date.fromisoformat(value).isoformat()
+        except (TypeError, ValueError):
+            raise ValueError("must be a date (YYYY-MM-DD)")
+    return convert
+
+def _select(field: Dict[str, Any]) -> Callable[[Any], str]:
+    options = frozenset(field.get("options") or [])
+    def convert(value: Any) -> str:
+        if not isinstance(value, str) or (options and value not in options):
+            raise ValueError("is not one of the options")
+        return value
+    return convert
+
+def _checkbox(field: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    options = frozenset(field.get("options") or [])
+    def convert(value: Any) -> List[str]:
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ValueError("must be a list of options")
+        if options and not options.issuperset(value):
+            raise ValueError("contains an unknown option")
+        return value
+    return convert
+
+def _any(field: Dict[str, Any]) -> Callable[[Any], Any]:
+    return lambda value: value
+
+CONVERTERS = {
+    "rating": _rating,
+    "boolean": _boolean,
+    "input": _text,
+    "text": _text,
+    "phone": _text,
+    "email": _email,
+    "date": _date,
+    "select": _select,
+    "checkbox": _checkbox,
+    "file": _any,
+}
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+class CompiledFormValidator:
+    """
+    Validator for one version of a form schema. Field definitions are turned
+    into converter closures once, so validating a submission is a single
+    pass over the answers.
+    """
+
+    def __init__(self, fields: List[Dict[str, Any]]):
+        self.fields: List[Tuple[str, str, bool, Callable[[Any], Any]]] = []
+        for field in fields:
+            fid, ftype = field.get("id"), field.get("type")
+            if not fid or ftype == "section":
+                continue
+            label = field.get("label") or fid
+            self.fields.append((fid, label, bool(field.get("required")), CONVERTERS.get(ftype, _any)(field)))
+        self.known = frozenset(f[0] for f in self.fields)
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return a normalized copy of `data` or raise FormValidationError.
+        """
+        errors = [f"Unknown field '{k}'" for k in data if k not in self.known]
+        clean: Dict[str, Any] = {}
+        for fid, label, required, convert in self.fields:
+            value = data.get(fid)
+            if _is_empty(value):
+                if required:
+                    errors.append(f"'{label}' is required")
+                elif fid in data:
+                    clean[fid] = value
+                continue
+            try:
+                clean[fid] = convert(value)
+            except ValueError as e:
+                errors.append(f"'{label}' {e}")
+        if errors:
+            raise FormValidationError(errors)
+        return clean
+
+class ValidationService:
+    """
+    Validates public submissions against the form's `fields`. Compiled
+    validators are kept in an LRU keyed by (form_id, schema hash), so an
+    edited form gets a fresh validator and old versions age out.
+    """
+
+    def __init__(self, cache_size: int):
+        self._validators = RecentKeyCache(cache_size)
+
+    @staticmethod
+    def schema_hash(fields: List[Dict[str, Any]]) -> str:
+        return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get_validator(self, form_id: int, form_schema: Optional[Dict[str, Any]]) -> Optional[CompiledFormValidator]:
+        fields = (form_schema or {}).get("fields")
+        if not fields:
+            return None # Schema-less forms accept any answers
+        key = (form_id, self.schema_hash(fields))
+        validator = self._validators.get(key)
+        if validator is None:
+            validator = CompiledFormValidator(fields)
+            self._validators.put(key, validator)
+        return validator
+
+    def validate(self, form, data: Dict[str, Any]) -> Dict[str, Any]:
+        validator = self.get_validator(form.id, form.form_schema)
+        return validator.validate(data or {}) if validator else data
+
+validation_service = ValidationService(settings.FORM_VALIDATOR_CACHE_SIZE)
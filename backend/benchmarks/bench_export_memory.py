@@ -0,0 +1,134 @@
+"""
+Peak memory of the CSV export: previous `.all()` implementation vs the
+chunked server-side cursor.
+
+Usage (from the backend directory):
+    python benchmarks/bench_export_memory.py --rows 1000000
+    python benchmarks/bench_export_memory.py --rows 1000000 --format parquet
+
+Seeds a throwaway SQLite file (or BENCH_DATABASE_URL) once, then runs each
+mode in a fresh process and reports RSS while the export is consumed.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.getcwd())
+
+_tmp_db = os.path.join(tempfile.gettempdir(), "bench_export.db")
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{_tmp_db}")
+
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select, func
+from app.db import base  # noqa: F401
+from app.db.session import engine
+from app.models.form import Form, Values
+from app.models.tenant import Tenant
+
+engine.echo = False
+
+SCHEMA = {"fields": [
+    {"id": "q1", "type": "rating", "label": "Overall"},
+    {"id": "q2", "type": "text", "label": "Comments"},
+    {"id": "q3", "type": "select", "label": "Department"},
+]}
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def seed(rows: int) -> int:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        form = db.exec(select(Form).where(Form.slug == f"bench-export-{rows}")).first()
+        if form and db.exec(select(func.count(Values.id)).where(Values.form_id == form.id)).one() == rows:
+            return form.id
+        tenant = Tenant(name="Bench", slug=f"bench-export-{time.time_ns()}")
+        db.add(tenant)
+        db.flush()
+        form = Form(title="Bench", slug=f"bench-export-{rows}-{time.time_ns()}", tenant_id=tenant.id, form_schema=SCHEMA)
+        db.add(form)
+        db.commit()
+        start = datetime(2024, 1, 1)
+        batch = 50000
+        for n in range(0, rows, batch):
+            db.execute(insert(Values), [
+                {"form_id": form.id, "created_at": start + timedelta(seconds=i * 30),
+                 "data": {"q1": i % 5 + 1, "q2": f"comment number {i} about the visit", "q3": "Radiology"},
+                 "sentiment": "neutral", "analysis_status": "complete"}
+                for i in range(n, min(n + batch, rows))
+            ])
+            db.commit()
+        form.slug = f"bench-export-{rows}"
+        db.add(form)
+        db.commit()
+        return form.id
+
+def legacy_csv(form: Form):
+    """
+    Previous implementation: load every ORM row, then format one row per yield.
+    """
+    import csv
+    import io
+    with Session(engine) as db:
+        responses = db.exec(select(Values).where(Values.form_id == form.id)).all()
+    field_order = [f["id"] for f in form.form_schema["fields"]]
+    output = io.StringIO()
+    writer = csv.writer(output)
+    for r in responses:
+        writer.writerow([str(r.id), r.created_at.isoformat(), str(r.location_id or "")] +
+                        [str(r.data.get(fid, "")) for fid in field_order])
+        output.seek(0)
+        yield output.read()
+        output.truncate(0)
+        output.seek(0)
+
+def consume(mode: str, form_id: int, format: str) -> None:
+    from app.services.export_service import export_service
+    with Session(engine) as db:
+        form = db.get(Form, form_id)
+        db.expunge(form)
+    stream = legacy_csv(form) if mode == "legacy" else export_service.iter_export(form, format)
+
+    baseline = rss_mb()
+    samples = []
+    size = pieces = 0
+    start = time.perf_counter()
+    for piece in stream:
+        size += len(piece)
+        pieces += 1
+        if pieces % 200 == 0 or mode == "stream":
+            samples.append(round(rss_mb()))
+    elapsed = time.perf_counter() - start
+    # Sampled rather than ru_maxrss, which Linux carries over from the parent across exec
+    peak = max(samples, default=baseline)
+    label = "csv" if mode == "legacy" else format
+    print(f"{mode:>7}: {size / 1e6:7.1f} MB {label} in {elapsed:5.1f}s, {pieces} yields, "
+          f"RSS start {baseline:.0f} MB, peak {peak:.0f} MB, samples {samples[::max(1, len(samples) // 8)]}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=["legacy", "stream"])
+    parser.add_argument("--form-id", type=int)
+    parser.add_argument("--format", default="csv", choices=["csv", "ndjson", "parquet", "xlsx"])
+    args = parser.parse_args()
+
+    if args.mode:
+        consume(args.mode, args.form_id, args.format)
+        return
+
+    form_id = seed(args.rows)
+    print(f"{args.rows} rows on {engine.url.render_as_string(hide_password=True)}")
+    for mode in ("legacy", "stream"):
+        subprocess.run([sys.executable, __file__, "--mode", mode, "--form-id", str(form_id), "--format", args.format], check=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare per-request commit with group commit for public feedback inserts.
+
+Usage (from the backend directory):
+    python benchmarks/bench_group_commit.py --threads 32 --requests 2000
+
+Uses a throwaway SQLite file unless BENCH_DATABASE_URL is set
+(point it at a scratch Postgres database to measure real fsync cost).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.append(os.getcwd())
+
+_tmp_db = os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{_tmp_db}")
+
+from sqlmodel import Session, SQLModel
+from app.db import base  # noqa: F401
+from app.db.session import engine
+from app.models.form import Form, Values
+from app.models.tenant import Tenant
+from app.services.ingest_service import FeedbackIngestService
+from app.services.usage_service import usage_service
+
+engine.echo = False
+
+def setup() -> Form:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as db:
+        tenant = Tenant(name="Bench", slug=f"bench-{time.time_ns()}")
+        db.add(tenant)
+        db.flush()
+        form = Form(title="Bench", slug=f"bench-{time.time_ns()}", tenant_id=tenant.id, is_published=True)
+        db.add(form)
+        db.commit()
+        db.refresh(form)
+        return form
+
+def make_row(form: Form) -> dict:
+    return {"form_id": form.id, "location_id": None, "data": {"q1": 5, "q2": "great"},
+            "created_at": datetime.utcnow(), "sentiment": "positive", "ai_analysis": None}
+
+def per_request(form: Form) -> int:
+    with Session(engine) as db:
+        usage_service.reserve_responses(db, form.tenant_id)
+        obj = Values(**make_row(form))
+        db.add(obj)
+        db.commit()
+        return obj.id
+
+def run(label, fn, threads, requests):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        ids = list(pool.map(lambda _: fn(), range(requests)))
+    elapsed = time.perf_counter() - start
+    assert len(set(ids)) == requests
+    print(f"{label:<22} {requests} inserts in {elapsed:6.2f}s  ->  {requests / elapsed:8.0f} req/s")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--interval-ms", type=int, default=25)
+    args = parser.parse_args()
+
+    form = setup()
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    run("per-request commit", lambda: per_request(form), args.threads, args.requests)
+
+    ingest = FeedbackIngestService(batch_size=args.batch_size, interval_ms=args.interval_ms)
+    run("group commit", lambda: ingest.submit(make_row(form), form.tenant_id).result(), args.threads, args.requests)
+    ingest.shutdown()
+
+if __name__ == "__main__":
+    main()
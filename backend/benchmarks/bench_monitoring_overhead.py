@@ -0,0 +1,137 @@
+"""
+Per-request overhead of MonitoringMiddleware: previous BaseHTTPMiddleware
+implementation vs the pure ASGI one, against no middleware at all.
+
+Usage (from the backend directory):
+    python benchmarks/bench_monitoring_overhead.py --requests 5000
+
+Requests are driven straight through the ASGI interface (no server, no
+sockets) so only the middleware cost shows up. Request logging is silenced
+for every variant; pass --log to include it (written to /dev/null).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.metrics import metrics, route_template
+from app.core.monitoring import MonitoringMiddleware, logger
+
+class LegacyMonitoringMiddleware(BaseHTTPMiddleware):
+    """
+    Previous implementation (BaseHTTPMiddleware, wall clock).
+    """
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        path = request.url.path
+        method = request.method
+        client_ip = request.client.host if request.client else "unknown"
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        except Exception as e:
+            status_code = 500
+            logger.error(json.dumps({"event": "error", "message": str(e), "path": path, "method": method}), exc_info=True)
+            raise e
+        finally:
+            process_time = time.time() - start_time
+            tenant_id = getattr(request.state, "tenant_id", None)
+            metrics.observe_request(method, route_template(request.scope), status_code, tenant_id, process_time)
+            log_payload = {
+                "event": "request_completed", "method": method, "path": path, "status_code": status_code,
+                "duration_ms": round(process_time * 1000, 2), "client_ip": client_ip,
+            }
+            if "/public/" in path:
+                log_payload["metric_type"] = "public_usage"
+            logger.info(json.dumps(log_payload))
+
+VARIANTS = {"none": None, "legacy": LegacyMonitoringMiddleware, "asgi": MonitoringMiddleware}
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{id}")
+    async def read_item(id: int):
+        return {"id": id, "ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(64):
+                yield b"x" * 1024
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    if middleware:
+        app.add_middleware(middleware)
+    return app
+
+async def drive(app: FastAPI, path: str, requests: int) -> float:
+    """
+    Seconds per request, calling the ASGI app directly.
+    """
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 5000), "server": ("bench", 80),
+    }
+
+    async def request():
+        # Like a server: the body once, then wait until the response is done
+        done = asyncio.Event()
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                done.set()
+
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await request()
+    return (time.perf_counter() - start) / requests
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--log", action="store_true", help="Include the JSON request log line")
+    args = parser.parse_args()
+
+    if args.log:
+        logger.handlers = [logging.FileHandler(os.devnull)]
+        logger.propagate = False
+    else:
+        logger.setLevel(logging.WARNING)
+
+    for label, path in (("JSON endpoint", "/items/42"), ("StreamingResponse, 64 x 1 KiB", "/stream")):
+        print(f"{label} ({args.requests} requests, best of {args.repeat})")
+        results = {}
+        for name, middleware in VARIANTS.items():
+            app = build_app(middleware)
+            asyncio.run(drive(app, path, 500)) # Warm up
+            results[name] = min(asyncio.run(drive(app, path, args.requests)) for _ in range(args.repeat))
+        for name, seconds in results.items():
+            overhead = seconds - results["none"]
+            print(f"  {name:>6}: {seconds * 1e6:7.1f} us/request" + (f"  (+{overhead * 1e6:.1f} us)" if name != "none" else ""))
+
+if __name__ == "__main__":
+    main()
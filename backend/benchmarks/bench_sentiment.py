@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: compiled lexicon matcher vs. the previous substring scan.
+
+Usage (from the backend directory):
+    python benchmarks/bench_sentiment.py --texts 100000
+
+On a tiny lexicon the substring scan is competitive (a handful of C-level
+`in` checks); its cost grows with lexicon size while the token/hash engine
+stays flat, and only the latter respects word boundaries and negation.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.getcwd())
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.core.ai import AIService, LEXICON
+
+def make_legacy(lexicon):
+    """
+    Previous implementation (one substring scan of the text per lexicon word),
+    parameterized by lexicon so both engines can be compared on equal terms.
+    """
+    negative_words = [w for w, weight in lexicon.items() if weight < 0]
+    positive_words = [w for w, weight in lexicon.items() if weight > 0]
+
+    def analyze_sentiment(text: str) -> str:
+        if not text:
+            return "neutral"
+        text_lower = text.lower()
+        score = 0
+        for w in positive_words:
+            if w in text_lower: score += 1
+        for w in negative_words:
+            if w in text_lower: score -= 1
+        if score > 0: return "positive"
+        if score < 0: return "negative"
+        return "neutral"
+
+    return analyze_sentiment
+
+WORDS = ("the staff was very friendly but the waiting area was not clean and the doctor "
+         "did not seem rude at all the badge scanner was broken service was really fast "
+         "great food terrible parking").split()
+
+def make_texts(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(3, 40))) for _ in range(n)]
+
+def bench(label, fn, texts):
+    start = time.perf_counter()
+    fn(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {len(texts)} texts in {elapsed:6.3f}s  ->  {len(texts) / elapsed:10.0f} texts/s")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=100000)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+    for extra in (0, 500, 2000):
+        # Pad with synthetic entries to see how each engine scales with lexicon size
+        lexicon = dict(LEXICON, **{f"zzword{i}": (1.0 if i % 2 else -1.0) for i in range(extra)})
+        legacy = make_legacy(lexicon)
+        engine = AIService(lexicon)
+        print(f"-- lexicon size {len(lexicon)}")
+        bench("legacy substring scan", lambda ts: [legacy(t) for t in ts], texts)
+        bench("compiled analyze_batch", engine.analyze_batch, texts)
+
+if __name__ == "__main__":
+    main()
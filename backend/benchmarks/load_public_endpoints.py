@@ -0,0 +1,62 @@
+"""
+Load test for the public QR paths (form fetch + feedback submit).
+
+Start the API with rate limiting disabled, then point this script at it:
+    RATE_LIMIT_ENABLED=false uvicorn app.main:app --workers 1
+    python benchmarks/load_public_endpoints.py --base-url http://127.0.0.1:8000 --concurrency 200
+
+Run it against the sync (`def`) and async (`async def`) versions of the
+endpoints to compare: sync handlers are capped by the AnyIO threadpool
+(40 tokens by default), async handlers are not. Requires `httpx`.
+Raise the seeded plan's `max_responses_per_month` first, otherwise
+submits past the quota are counted as 402 errors.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+async def worker(client, method, url, payload, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, json=payload)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        latencies.append(time.perf_counter() - start)
+
+async def run(label, base_url, method, path, payload, concurrency, duration):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*[
+            worker(client, method, path, payload, deadline, latencies, errors)
+            for _ in range(concurrency)
+        ])
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{label:<8} c={concurrency:<4} {len(latencies) / duration:8.0f} req/s  "
+          f"p50={p50:7.1f}ms  p99={p99:7.1f}ms  errors={len(errors)}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--slug", default="er-feedback")
+    parser.add_argument("--form-id", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    api = "/api/v1/forms/public"
+    asyncio.run(run("fetch", args.base_url, "GET", f"{api}/{args.slug}", None, args.concurrency, args.duration))
+    payload = {"form_id": args.form_id, "data": {"q1": 5, "q2": "load test"}}
+    asyncio.run(run("submit", args.base_url, "POST", f"{api}/feedback", payload, args.concurrency, args.duration))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+The tenant lists must not issue per-tenant queries: the number of SQL
+statements for a page is the same for a small and a large page.
+
+Run from the backend directory:
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_tmp_db = os.path.join(tempfile.mkdtemp(), "test_tenant_summaries.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_db}"
+for worker in ("SENTIMENT", "ROLLUP", "EXPORT"):
+    os.environ[f"{worker}_WORKER_IN_PROCESS"] = "false"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select
+from app.core.security import get_password_hash
+from app.db.session import engine
+from app.main import app
+from app.models.form import Form
+from app.models.location import Location
+from app.models.tenant import Tenant
+from app.models.user import User, UserRole
+
+SMALL_PAGE = 3
+LARGE_PAGE = 40
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="module")
+def tenants(client):
+    """
+    LARGE_PAGE tenants, each with an admin, a form and a location, all
+    assigned to the seeded fleeter.
+    """
+    with Session(engine) as db:
+        fleeter = db.exec(select(User).where(User.email == "sales@saas.com")).one()
+        for i in range(LARGE_PAGE):
+            tenant = Tenant(name=f"Summary Tenant {i}", slug=f"summary-tenant-{i}", assigned_fleeter_id=fleeter.id)
+            db.add(tenant)
+            db.flush()
+            db.add(User(
+                email=f"admin{i}@summary-tenant.com",
+                hashed_password=get_password_hash("password"),
+                role=UserRole.TENANT_ADMIN,
+                tenant_id=tenant.id,
+            ))
+            db.add(Form(title="Feedback", slug=f"summary-form-{i}", tenant_id=tenant.id))
+            db.add(Location(name="Main", slug=f"summary-location-{i}", tenant_id=tenant.id))
+        db.commit()
+        return db.exec(select(Tenant.id).where(Tenant.assigned_fleeter_id == fleeter.id)).all()
+
+def login(client, email: str, password: str) -> dict:
+    r = client.post("/api/v1/login/access-token", data={"username": email, "password": password})
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+def count_queries(client, url: str, headers: dict) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        r = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert r.status_code == 200, r.text
+    return len(statements)
+
+def test_list_tenants_query_count_is_constant(client, tenants):
+    headers = login(client, "admin@saas.com", "adminpassword")
+    small = count_queries(client, f"/api/v1/admin/tenants?limit={SMALL_PAGE}", headers)
+    large = count_queries(client, f"/api/v1/admin/tenants?limit={LARGE_PAGE}", headers)
+    assert small == large
+
+def test_list_assigned_tenants_query_count_is_constant(client, tenants):
+    headers = login(client, "sales@saas.com", "password")
+    with Session(engine) as db:
+        # Shrink the fleeter's book to a small page, measure, then restore it
+        unassigned = db.exec(select(Tenant).where(Tenant.id.in_(tenants[SMALL_PAGE:]))).all()
+        fleeter_id = unassigned[0].assigned_fleeter_id
+        for tenant in unassigned:
+            tenant.assigned_fleeter_id = None
+            db.add(tenant)
+        db.commit()
+        small = count_queries(client, "/api/v1/fleeter/tenants/", headers)
+
+        for tenant in unassigned:
+            tenant.assigned_fleeter_id = fleeter_id
+            db.add(tenant)
+        db.commit()
+        large = count_queries(client, "/api/v1/fleeter/tenants/", headers)
+
+    assert small == large
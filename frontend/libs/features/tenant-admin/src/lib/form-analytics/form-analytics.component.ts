@@ -1,6 +1,6 @@
 import { Component, inject, OnInit, signal } from '@angular/core';
 import { CommonModule } from '@angular/common';
-import { TenantAdminService, Form, FormStats } from '../tenant-admin.service';
+import { TenantAdminService, Form, FormStats, FeedbackResponse } from '../tenant-admin.service';
 import { ActivatedRoute, RouterModule } from '@angular/router';
 import { FormsModule } from '@angular/forms';
 
@@ -70,7 +70,7 @@ import { FormsModule } from '@angular/forms';
         </div>
         <div class="border-t border-gray-200">
             <ul class="divide-y divide-gray-200">
-                <li *ngFor="let response of stats.recent_responses" class="px-4 py-4 sm:px-6 hover:bg-gray-50">
+                <li *ngFor="let response of responses" class="px-4 py-4 sm:px-6 hover:bg-gray-50">
                     <div class="flex items-center justify-between">
                         <div class="text-sm font-medium text-indigo-600 truncate">
                             ID: {{ response.id }} <span *ngIf="response.location_id" class="text-gray-400 font-normal ml-2">(Loc: {{response.location_id}})</span>
@@ -87,10 +87,13 @@ import { FormsModule } from '@angular/forms';
                         </div>
                     </div>
                 </li>
-                 <li *ngIf="stats.recent_responses.length === 0" class="px-4 py-8 text-center text-gray-500">
+                 <li *ngIf="responses.length === 0" class="px-4 py-8 text-center text-gray-500">
                     No responses found for these filters.
                  </li>
             </ul>
+            <div *ngIf="nextCursor" class="px-4 py-3 text-center border-t border-gray-200">
+                <button (click)="loadMore()" class="text-sm text-indigo-600 hover:text-indigo-800">Load more</button>
+            </div>
         </div>
       </div>
     </div>
@@ -105,6 +108,8 @@ export class FormAnalyticsComponent implements OnInit {
 
     form: Form | null = null;
     stats: FormStats | null = null;
+    responses: FeedbackResponse[] = [];
+    nextCursor: string | null = null;
 
     filters = {
         start_date: '',
@@ -124,11 +129,29 @@ export class FormAnalyticsComponent implements OnInit {
         // Parallel load
         this.service.getForm(id).subscribe(f => this.form = f);
         this.service.getFormStats(id, this.cleanFilters()).subscribe(s => this.stats = s);
+        this.loadResponses(id);
     }
 
     refresh() {
         if (this.form) {
             this.service.getFormStats(this.form.id, this.cleanFilters()).subscribe(s => this.stats = s);
+            this.loadResponses(this.form.id);
+        }
+    }
+
+    loadResponses(id: number) {
+        this.service.getFormResponses(id, this.cleanFilters()).subscribe(page => {
+            this.responses = page.items;
+            this.nextCursor = page.next_cursor ?? null;
+        });
+    }
+
+    loadMore() {
+        if (this.form && this.nextCursor) {
+            this.service.getFormResponses(this.form.id, this.cleanFilters(), this.nextCursor).subscribe(page => {
+                this.responses = [...this.responses, ...page.items];
+                this.nextCursor = page.next_cursor ?? null;
+            });
         }
     }
 
@@ -92,6 +92,17 @@ export class TenantAdminService {
         return this.http.get<FormStats>(`${this.apiUrl}/forms/${id}/stats`, { params });
     }
 
+    getFormResponses(id: number, filters?: any, cursor?: string | null): Observable<ResponsePage> {
+        let params: any = { limit: 50 };
+        if (filters) {
+            if (filters.start_date) params.start_date = filters.start_date;
+            if (filters.end_date) params.end_date = filters.end_date;
+            if (filters.location_id) params.location_id = filters.location_id;
+        }
+        if (cursor) params.cursor = cursor;
+        return this.http.get<ResponsePage>(`${this.apiUrl}/forms/${id}/responses`, { params });
+    }
+
     exportFormCsv(id: number, filters?: any): Observable<Blob> {
         let params: any = {};
         if (filters) {
@@ -108,7 +119,19 @@ export class TenantAdminService {
 export interface FormStats {
     total_responses: number;
     field_summaries: Record<string, { label: string, type: string, average?: number, count: number }>;
-    recent_responses: any[];
+}
+
+export interface FeedbackResponse {
+    id: number;
+    created_at: string;
+    data: Record<string, any>;
+    location_id?: number | null;
+    sentiment?: string | null;
+}
+
+export interface ResponsePage {
+    items: FeedbackResponse[];
+    next_cursor?: string | null;
 }
 
 export interface Form {
@@ -6,6 +6,8 @@ export interface FeedbackStat {
   field_summaries?: {
 [key: string]: any;
 };
-  recent_responses: Array<any>;
+  sentiment_counts?: {
+[key: string]: number;
+};
   total_responses: number;
 }